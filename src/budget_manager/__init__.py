@@ -10,3 +10,7 @@ GitHub: https://github.com/tara32473/budget-manager
 
 __version__ = "1.0.0"
 __author__ = "tara32473"
+
+# Submodules are deliberately not imported here: every ``budget`` invocation
+# imports this package, and the CLI loads the database/report stack lazily.
+__all__ = []
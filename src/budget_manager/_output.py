@@ -0,0 +1,30 @@
+"""
+Console output helpers shared by the CLI and the report generator.
+
+Author: tara32473
+GitHub: https://github.com/tara32473/budget-manager
+"""
+
+import os
+import sys
+from typing import List
+
+
+def write_lines(lines: List[str]) -> None:
+    """Write ``lines`` to stdout with a single call.
+
+    Redirected output is encoded once and written to the binary buffer;
+    terminals and text-only streams go through ``sys.stdout.write``.
+    """
+    stdout = sys.stdout
+    buffer = getattr(stdout, "buffer", None)
+    if buffer is None or stdout.isatty():
+        stdout.write("\n".join(lines) + "\n")
+        return
+
+    data = (os.linesep.join(lines) + os.linesep).encode(
+        stdout.encoding or "utf-8", stdout.errors or "strict"
+    )
+    stdout.flush()
+    buffer.write(data)
+    buffer.flush()
@@ -10,85 +10,230 @@ GitHub: https://github.com/tara32473/budget-manager
 
 import argparse
 import sys
-from datetime import datetime, timedelta
-from decimal import Decimal, InvalidOperation
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
 
-from .database import DatabaseManager
-from .models import Budget, Category, Transaction, TransactionType
-from .reports import ReportGenerator
+from . import __version__
+from ._output import write_lines
 
+if TYPE_CHECKING:
+    from datetime import datetime
+    from decimal import Decimal
 
-class BudgetManagerCLI:
-    """Main CLI class for the budget manager application."""
+    from .database import DatabaseManager
+    from .models import TransactionType
+    from .reports import ReportGenerator
 
-    def __init__(self, db_path: str = None):
-        """Initialize CLI with database manager."""
-        self.db = DatabaseManager(db_path)
-        self.report_generator = ReportGenerator(self.db)
-
-    def run(self):
-        """Main entry point for the CLI."""
-        parser = self.create_parser()
-        args = parser.parse_args()
-
-        if hasattr(args, "func"):
-            try:
-                args.func(args)
-            except Exception as e:
-                print(f"Error: {e}")
-                sys.exit(1)
-        else:
-            parser.print_help()
+# The database, model and report modules are imported lazily inside the
+# command handlers so that ``--help``/``--version`` never load them.
 
-    def create_parser(self):
-        """Create the argument parser with all subcommands."""
-        parser = argparse.ArgumentParser(
-            description="Budget Manager - Personal Finance Tracking Tool",
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog="""
+_EPILOG = """
 Examples:
   budget add-category Food "Restaurant and grocery expenses"
   budget add-transaction expense 50.00 Food "Grocery shopping"
   budget set-budget Food 500.00
   budget list-transactions --last-month
   budget report monthly
-            """,
+            """
+
+# Row templates for the list commands
+_CATEGORY_ROW_FMT = "{name:<20} {desc:<40} {created:<20}"
+_TXN_ROW_FMT = "{d:<12} {t:<8} {a:<12} {c:<15} {desc:<30} {i:<10}"
+_BUDGET_ROW_FMT = "{c:<15} ${a:<11.2f} {p:<10} {s:<12} {st:<8} {i:<10}"
+_STATUS_ROW_FMT = "{c:<15} ${b:<11} ${s:<11} ${r:<11} {p:<7.1f}% {st:<12}"
+
+# Subcommand name -> name of the method that registers its group
+_COMMAND_GROUPS = {
+    "add-category": "_add_category_commands",
+    "list-categories": "_add_category_commands",
+    "update-category": "_add_category_commands",
+    "delete-category": "_add_category_commands",
+    "add-transaction": "_add_transaction_commands",
+    "list-transactions": "_add_transaction_commands",
+    "update-transaction": "_add_transaction_commands",
+    "delete-transaction": "_add_transaction_commands",
+    "set-budget": "_add_budget_commands",
+    "list-budgets": "_add_budget_commands",
+    "budget-status": "_add_budget_commands",
+    "delete-budget": "_add_budget_commands",
+    "report": "_add_report_commands",
+}
+
+
+def _sniff_subcommand(argv: List[str]) -> Optional[str]:
+    """Return the subcommand named in argv, or None if there is none.
+
+    Top-level ``-h``/``--help`` and unknown commands also give None so that
+    the full parser is built and help/error output lists every command.
+    """
+    for token in argv:
+        if token in ("-h", "--help"):
+            return None
+        if token.startswith("-"):
+            continue
+        return token if token in _COMMAND_GROUPS else None
+    return None
+
+
+def _decimal_arg(value: str) -> "Decimal":
+    """Argparse type converting an amount string to a Decimal."""
+    from decimal import Decimal, InvalidOperation
+
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise argparse.ArgumentTypeError(f"Invalid amount '{value}'")
+    return amount
+
+
+def _txn_type(value: str) -> "TransactionType":
+    """Argparse type converting "income"/"expense" to a TransactionType."""
+    from .models import TransactionType
+
+    try:
+        return TransactionType(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: '{value}' (choose from 'income', 'expense')"
+        )
+
+
+_TXN_TYPE_METAVAR = "{income,expense}"
+
+
+@lru_cache(maxsize=64)
+def _parse_date(value: str) -> "datetime":
+    """Parse a YYYY-MM-DD string into a datetime."""
+    from datetime import datetime
+
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def _date_arg(value: str) -> "datetime":
+    """Argparse type converting a YYYY-MM-DD string to a datetime."""
+    try:
+        return _parse_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date format '{value}'. Use YYYY-MM-DD."
+        )
+
+
+def _format_cents(cents: int) -> str:
+    """Format an integer number of cents as a plain ``D.CC`` string."""
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+class BudgetManagerCLI:
+    """Main CLI class for the budget manager application."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Initialize CLI; the database is opened on first use."""
+        self.db_path = db_path
+        self._db: Optional["DatabaseManager"] = None
+        self._rg: Optional["ReportGenerator"] = None
+
+    @property
+    def db(self) -> "DatabaseManager":
+        """Database manager, created on first access."""
+        if self._db is None:
+            from .database import DatabaseManager
+
+            self._db = DatabaseManager(self.db_path)
+        return self._db
+
+    def close(self) -> None:
+        """Close the database if it was opened."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _confirm(self, message: str) -> bool:
+        """Ask a yes/no question; without a terminal the answer is no."""
+        if not sys.stdin.isatty():
+            print("Cannot ask for confirmation without a terminal; use --force.")
+            return False
+        return input(f"{message} (y/N): ").lower() == "y"
+
+    def run(self, argv: Optional[List[str]] = None) -> None:
+        """Main entry point for the CLI.
+
+        ``argv`` defaults to ``sys.argv[1:]``.
+        """
+        if argv is None:
+            argv = sys.argv[1:]
+        parser = self.create_parser(argv)
+        args = parser.parse_args(argv)
+
+        handler = self.COMMAND_TABLE.get(args.command)
+        if handler is None:
+            # Nothing to dispatch: skip all database work
+            parser.print_help()
+            return
+
+        try:
+            handler(self, args)
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @classmethod
+    def create_parser(cls, argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+        """Create the argument parser.
+
+        With ``argv``, only the subcommand group it names is registered;
+        all groups are registered when it is None or names no command.
+        The parser holds no instance state, so one can be shared.
+        """
+        parser = argparse.ArgumentParser(
+            description="Budget Manager - Personal Finance Tracking Tool",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog=_EPILOG,
         )
 
         # Add version argument
         parser.add_argument(
-            "--version", action="version", version="Budget Manager 1.0.0"
+            "--version", action="version", version=f"Budget Manager {__version__}"
         )
 
         subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
+        command = None if argv is None else _sniff_subcommand(argv)
+        if command is not None:
+            getattr(cls, _COMMAND_GROUPS[command])(subparsers)
+            return parser
+
         # Category commands
-        self._add_category_commands(subparsers)
+        cls._add_category_commands(subparsers)
 
         # Transaction commands
-        self._add_transaction_commands(subparsers)
+        cls._add_transaction_commands(subparsers)
 
         # Budget commands
-        self._add_budget_commands(subparsers)
+        cls._add_budget_commands(subparsers)
 
         # Report commands
-        self._add_report_commands(subparsers)
+        cls._add_report_commands(subparsers)
 
         return parser
 
-    def _add_category_commands(self, subparsers):
+    @staticmethod
+    def _add_category_commands(
+        subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+    ) -> None:
         """Add category-related commands."""
         # Add category
         add_cat = subparsers.add_parser("add-category", help="Add a new category")
         add_cat.add_argument("name", help="Category name")
         add_cat.add_argument("description", nargs="?", help="Category description")
         add_cat.add_argument("--color", help="Category color (hex code)")
-        add_cat.set_defaults(func=self.add_category)
 
         # List categories
-        list_cat = subparsers.add_parser("list-categories", help="List all categories")
-        list_cat.set_defaults(func=self.list_categories)
+        subparsers.add_parser("list-categories", help="List all categories")
 
         # Update category
         update_cat = subparsers.add_parser("update-category", help="Update a category")
@@ -96,7 +241,6 @@ Examples:
         update_cat.add_argument("--new-name", help="New category name")
         update_cat.add_argument("--description", help="New description")
         update_cat.add_argument("--color", help="New color (hex code)")
-        update_cat.set_defaults(func=self.update_category)
 
         # Delete category
         del_cat = subparsers.add_parser("delete-category", help="Delete a category")
@@ -104,27 +248,37 @@ Examples:
         del_cat.add_argument(
             "--force", action="store_true", help="Force deletion without confirmation"
         )
-        del_cat.set_defaults(func=self.delete_category)
 
-    def _add_transaction_commands(self, subparsers):
+    @staticmethod
+    def _add_transaction_commands(
+        subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+    ) -> None:
         """Add transaction-related commands."""
         # Add transaction
         add_trans = subparsers.add_parser(
             "add-transaction", help="Add a new transaction"
         )
         add_trans.add_argument(
-            "-a", "--amount", required=True, type=str, help="Transaction amount"
+            "-a",
+            "--amount",
+            required=True,
+            type=_decimal_arg,
+            help="Transaction amount",
         )
         add_trans.add_argument(
             "-d", "--description", required=True, help="Transaction description"
         )
         add_trans.add_argument("-c", "--category", help="Category name")
         add_trans.add_argument(
-            "type", choices=["income", "expense"], help="Transaction type"
+            "type",
+            type=_txn_type,
+            metavar=_TXN_TYPE_METAVAR,
+            help="Transaction type",
+        )
+        add_trans.add_argument(
+            "--date", type=_date_arg, help="Transaction date (YYYY-MM-DD)"
         )
-        add_trans.add_argument("--date", help="Transaction date (YYYY-MM-DD)")
         add_trans.add_argument("--notes", help="Additional notes")
-        add_trans.set_defaults(func=self.add_transaction)
 
         # List transactions
         list_trans = subparsers.add_parser(
@@ -132,7 +286,10 @@ Examples:
         )
         list_trans.add_argument("--category", help="Filter by category name")
         list_trans.add_argument(
-            "--type", choices=["income", "expense"], help="Filter by type"
+            "--type",
+            type=_txn_type,
+            metavar=_TXN_TYPE_METAVAR,
+            help="Filter by type",
         )
         list_trans.add_argument(
             "--limit", type=int, default=20, help="Limit number of results"
@@ -143,24 +300,28 @@ Examples:
         list_trans.add_argument(
             "--last-month", action="store_true", help="Show last month only"
         )
-        list_trans.add_argument("--start-date", help="Start date (YYYY-MM-DD)")
-        list_trans.add_argument("--end-date", help="End date (YYYY-MM-DD)")
-        list_trans.set_defaults(func=self.list_transactions)
+        list_trans.add_argument(
+            "--start-date", type=_date_arg, help="Start date (YYYY-MM-DD)"
+        )
+        list_trans.add_argument(
+            "--end-date", type=_date_arg, help="End date (YYYY-MM-DD)"
+        )
 
         # Update transaction
         update_trans = subparsers.add_parser(
             "update-transaction", help="Update a transaction"
         )
         update_trans.add_argument("transaction_id", help="Transaction ID")
-        update_trans.add_argument("--amount", type=str, help="New amount")
+        update_trans.add_argument("--amount", type=_decimal_arg, help="New amount")
         update_trans.add_argument("--description", help="New description")
         update_trans.add_argument("--category", help="New category name")
         update_trans.add_argument(
-            "--type", choices=["income", "expense"], help="New type"
+            "--type", type=_txn_type, metavar=_TXN_TYPE_METAVAR, help="New type"
+        )
+        update_trans.add_argument(
+            "--date", type=_date_arg, help="New date (YYYY-MM-DD)"
         )
-        update_trans.add_argument("--date", help="New date (YYYY-MM-DD)")
         update_trans.add_argument("--notes", help="New notes")
-        update_trans.set_defaults(func=self.update_transaction)
 
         # Delete transaction
         del_trans = subparsers.add_parser(
@@ -170,16 +331,18 @@ Examples:
         del_trans.add_argument(
             "--force", action="store_true", help="Force deletion without confirmation"
         )
-        del_trans.set_defaults(func=self.delete_transaction)
 
-    def _add_budget_commands(self, subparsers):
+    @staticmethod
+    def _add_budget_commands(
+        subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+    ) -> None:
         """Add budget-related commands."""
         # Set budget
         set_budget = subparsers.add_parser(
             "set-budget", help="Set a budget for a category"
         )
         set_budget.add_argument("category", help="Category name")
-        set_budget.add_argument("amount", type=str, help="Budget amount")
+        set_budget.add_argument("amount", type=_decimal_arg, help="Budget amount")
         set_budget.add_argument(
             "period",
             choices=["weekly", "monthly", "yearly"],
@@ -187,8 +350,9 @@ Examples:
             nargs="?",
             help="Budget period",
         )
-        set_budget.add_argument("--start-date", help="Start date (YYYY-MM-DD)")
-        set_budget.set_defaults(func=self.set_budget)
+        set_budget.add_argument(
+            "--start-date", type=_date_arg, help="Start date (YYYY-MM-DD)"
+        )
 
         # List budgets
         list_budgets = subparsers.add_parser("list-budgets", help="List all budgets")
@@ -196,14 +360,12 @@ Examples:
         list_budgets.add_argument(
             "--include-inactive", action="store_true", help="Include inactive budgets"
         )
-        list_budgets.set_defaults(func=self.list_budgets)
 
         # Budget status
         budget_status = subparsers.add_parser(
             "budget-status", help="Show budget status"
         )
         budget_status.add_argument("--category", help="Specific category")
-        budget_status.set_defaults(func=self.budget_status)
 
         # Delete budget
         del_budget = subparsers.add_parser("delete-budget", help="Delete a budget")
@@ -211,9 +373,11 @@ Examples:
         del_budget.add_argument(
             "--force", action="store_true", help="Force deletion without confirmation"
         )
-        del_budget.set_defaults(func=self.delete_budget)
 
-    def _add_report_commands(self, subparsers):
+    @staticmethod
+    def _add_report_commands(
+        subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+    ) -> None:
         """Add report-related commands."""
         # Generate report
         report = subparsers.add_parser("report", help="Generate financial reports")
@@ -223,19 +387,24 @@ Examples:
             help="Report type",
         )
         report.add_argument(
-            "--start-date", help="Start date for custom report (YYYY-MM-DD)"
+            "--start-date",
+            type=_date_arg,
+            help="Start date for custom report (YYYY-MM-DD)",
         )
         report.add_argument(
-            "--end-date", help="End date for custom report (YYYY-MM-DD)"
+            "--end-date",
+            type=_date_arg,
+            help="End date for custom report (YYYY-MM-DD)",
         )
         report.add_argument("--category", help="Filter by category")
         report.add_argument("--export", choices=["csv", "json"], help="Export format")
         report.add_argument("--output", help="Output file path")
-        report.set_defaults(func=self.generate_report)
 
     # Category command implementations
-    def add_category(self, args):
+    def add_category(self, args: argparse.Namespace) -> None:
         """Add a new category."""
+        from .models import Category
+
         try:
             category = Category(
                 name=args.name, description=args.description, color=args.color
@@ -245,31 +414,34 @@ Examples:
         except ValueError as e:
             print(f"Error: {e}")
 
-    def list_categories(self, args):
+    def list_categories(self, args: argparse.Namespace) -> None:
         """List all categories."""
         categories = self.db.get_all_categories()
         if not categories:
             print("No categories found.")
             return
 
-        print(f"{'Name':<20} {'Description':<40} {'Created':<20}")
-        print("-" * 80)
+        lines = [f"{'Name':<20} {'Description':<40} {'Created':<20}", "-" * 80]
         for cat in categories:
             desc = cat.description or ""
             if len(desc) > 37:
                 desc = desc[:34] + "..."
-            print(
-                f"{cat.name:<20} {desc:<40} {cat.created_at.strftime('%Y-%m-%d %H:%M'):<20}"
+            lines.append(
+                _CATEGORY_ROW_FMT.format(
+                    name=cat.name,
+                    desc=desc,
+                    created=cat.created_at.strftime("%Y-%m-%d %H:%M"),
+                )
             )
+        write_lines(lines)
 
-    def update_category(self, args):
+    def update_category(self, args: argparse.Namespace) -> None:
         """Update an existing category."""
-        categories = [c for c in self.db.get_all_categories() if c.name == args.name]
-        if not categories:
+        category = self.db.get_category_by_name(args.name)
+        if category is None:
             print(f"Category '{args.name}' not found.")
             return
 
-        category = categories[0]
         if args.new_name:
             category.name = args.new_name
         if args.description is not None:
@@ -282,18 +454,15 @@ Examples:
         else:
             print("Failed to update category.")
 
-    def delete_category(self, args):
+    def delete_category(self, args: argparse.Namespace) -> None:
         """Delete a category."""
-        categories = [c for c in self.db.get_all_categories() if c.name == args.name]
-        if not categories:
+        category = self.db.get_category_by_name(args.name)
+        if category is None:
             print(f"Category '{args.name}' not found.")
             return
 
-        category = categories[0]
-
         if not args.force:
-            confirm = input(f"Are you sure you want to delete '{args.name}'? (y/N): ")
-            if confirm.lower() != "y":
+            if not self._confirm(f"Are you sure you want to delete '{args.name}'?"):
                 print("Deletion cancelled.")
                 return
 
@@ -303,38 +472,28 @@ Examples:
             print("Failed to delete category.")
 
     # Transaction command implementations
-    def add_transaction(self, args):
+    def add_transaction(self, args: argparse.Namespace) -> None:
         """Add a new transaction."""
-        try:
-            amount = Decimal(args.amount)
-        except InvalidOperation:
-            print(f"Error: Invalid amount '{args.amount}'")
-            return
+        from datetime import datetime
+
+        from .models import Transaction
 
         category_id = None
         if args.category:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == args.category
-            ]
-            if not categories:
+            category = self.db.get_category_by_name(args.category)
+            if category is None:
                 print(f"Category '{args.category}' not found.")
                 return
-            category_id = categories[0].id
+            category_id = category.id
 
-        transaction_date = datetime.now()
-        if args.date:
-            try:
-                transaction_date = datetime.strptime(args.date, "%Y-%m-%d")
-            except ValueError:
-                print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.")
-                return
+        transaction_date = args.date or datetime.now()
 
         try:
             transaction = Transaction(
-                amount=amount,
+                amount=args.amount,
                 description=args.description,
                 category_id=category_id,
-                transaction_type=TransactionType(args.type),
+                transaction_type=args.type,
                 date=transaction_date,
                 notes=args.notes,
             )
@@ -343,125 +502,91 @@ Examples:
         except ValueError as e:
             print(f"Error: {e}")
 
-    def list_transactions(self, args):
+    def list_transactions(self, args: argparse.Namespace) -> None:
         """List transactions with filters."""
+        from datetime import date, datetime, time, timedelta
+
         category_id = None
         if args.category:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == args.category
-            ]
-            if not categories:
+            category = self.db.get_category_by_name(args.category)
+            if category is None:
                 print(f"Category '{args.category}' not found.")
                 return
-            category_id = categories[0].id
-
-        transaction_type = None
-        if args.type:
-            transaction_type = TransactionType(args.type)
+            category_id = category.id
 
         start_date = None
         end_date = None
 
+        # Relative ranges start at midnight so the query is stable within a day
         if args.last_week:
-            start_date = datetime.now() - timedelta(days=7)
+            start_date = datetime.combine(date.today() - timedelta(days=7), time.min)
         elif args.last_month:
-            start_date = datetime.now() - timedelta(days=30)
+            start_date = datetime.combine(date.today() - timedelta(days=30), time.min)
         else:
-            if args.start_date:
-                try:
-                    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
-                except ValueError:
-                    print(
-                        f"Error: Invalid start date format '{args.start_date}'. Use YYYY-MM-DD."
-                    )
-                    return
-            if args.end_date:
-                try:
-                    end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
-                except ValueError:
-                    print(
-                        f"Error: Invalid end date format '{args.end_date}'. Use YYYY-MM-DD."
-                    )
-                    return
-
-        transactions = self.db.get_transactions(
+            start_date = args.start_date
+            end_date = args.end_date
+
+        rows = self.db.get_transactions_raw(
             category_id=category_id,
-            transaction_type=transaction_type,
+            transaction_type=args.type,
             start_date=start_date,
             end_date=end_date,
             limit=args.limit,
         )
 
-        if not transactions:
+        if not rows:
             print("No transactions found.")
             return
 
-        # Get category names for display
-        categories = {c.id: c.name for c in self.db.get_all_categories()}
-
-        print(
-            f"{'Date':<12} {'Type':<8} {'Amount':<12} {'Category':<15} {'Description':<30} {'ID':<10}"
-        )
-        print("-" * 95)
+        lines = [
+            f"{'Date':<12} {'Type':<8} {'Amount':<12} {'Category':<15} {'Description':<30} {'ID':<10}",
+            "-" * 95,
+        ]
 
-        for trans in transactions:
-            category_name = (
-                categories.get(trans.category_id, "N/A") if trans.category_id else "N/A"
-            )
+        for trans_id, day, trans_type, cents, category_name, description in rows:
+            category_name = category_name or "N/A"
             if len(category_name) > 12:
                 category_name = category_name[:9] + "..."
 
-            description = trans.description
-            if len(description) > 27:
-                description = description[:24] + "..."
-
-            amount_str = f"${trans.amount:.2f}"
-            trans_id = trans.id[:8] + "..."
+            desc = description if len(description) <= 27 else description[:24] + "..."
 
-            print(
-                f"{trans.date.strftime('%Y-%m-%d'):<12} "
-                f"{trans.transaction_type.value:<8} "
-                f"{amount_str:<12} "
-                f"{category_name:<15} "
-                f"{description:<30} "
-                f"{trans_id:<10}"
+            lines.append(
+                _TXN_ROW_FMT.format(
+                    d=day,
+                    t=trans_type,
+                    a="$" + _format_cents(cents),
+                    c=category_name,
+                    desc=desc,
+                    i=trans_id[:8] + "...",
+                )
             )
+        write_lines(lines)
 
-    def update_transaction(self, args):
+    def update_transaction(self, args: argparse.Namespace) -> None:
         """Update an existing transaction."""
         transaction = self.db.get_transaction(args.transaction_id)
         if not transaction:
             print(f"Transaction with ID '{args.transaction_id}' not found.")
             return
 
-        if args.amount:
-            try:
-                transaction.amount = Decimal(args.amount)
-            except InvalidOperation:
-                print(f"Error: Invalid amount '{args.amount}'")
-                return
+        if args.amount is not None:
+            transaction.amount = args.amount
 
         if args.description:
             transaction.description = args.description
 
         if args.category:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == args.category
-            ]
-            if not categories:
+            category = self.db.get_category_by_name(args.category)
+            if category is None:
                 print(f"Category '{args.category}' not found.")
                 return
-            transaction.category_id = categories[0].id
+            transaction.category_id = category.id
 
         if args.type:
-            transaction.transaction_type = TransactionType(args.type)
+            transaction.transaction_type = args.type
 
         if args.date:
-            try:
-                transaction.date = datetime.strptime(args.date, "%Y-%m-%d")
-            except ValueError:
-                print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.")
-                return
+            transaction.date = args.date
 
         if args.notes is not None:
             transaction.notes = args.notes
@@ -471,7 +596,7 @@ Examples:
         else:
             print("Failed to update transaction.")
 
-    def delete_transaction(self, args):
+    def delete_transaction(self, args: argparse.Namespace) -> None:
         """Delete a transaction."""
         transaction = self.db.get_transaction(args.transaction_id)
         if not transaction:
@@ -480,8 +605,7 @@ Examples:
 
         if not args.force:
             print(f"Transaction: {transaction.description} - ${transaction.amount}")
-            confirm = input("Are you sure you want to delete this transaction? (y/N): ")
-            if confirm.lower() != "y":
+            if not self._confirm("Are you sure you want to delete this transaction?"):
                 print("Deletion cancelled.")
                 return
 
@@ -491,55 +615,42 @@ Examples:
             print("Failed to delete transaction.")
 
     # Budget command implementations
-    def set_budget(self, args):
+    def set_budget(self, args: argparse.Namespace) -> None:
         """Set a budget for a category."""
-        categories = [
-            c for c in self.db.get_all_categories() if c.name == args.category
-        ]
-        if not categories:
-            print(f"Category '{args.category}' not found.")
-            return
+        from datetime import datetime
 
-        try:
-            amount = Decimal(args.amount)
-        except InvalidOperation:
-            print(f"Error: Invalid amount '{args.amount}'")
+        from .models import Budget
+
+        category = self.db.get_category_by_name(args.category)
+        if category is None:
+            print(f"Category '{args.category}' not found.")
             return
 
-        start_date = datetime.now()
-        if args.start_date:
-            try:
-                start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
-            except ValueError:
-                print(
-                    f"Error: Invalid date format '{args.start_date}'. Use YYYY-MM-DD."
-                )
-                return
+        start_date = args.start_date or datetime.now()
 
         try:
             budget = Budget(
-                category_id=categories[0].id,
-                amount=amount,
+                category_id=category.id,
+                amount=args.amount,
                 period=args.period,
                 start_date=start_date,
             )
             budget_id = self.db.create_budget(budget)
-            print(f"✓ Budget set for '{args.category}': ${amount} ({args.period})")
+            print(f"✓ Budget set for '{args.category}': ${args.amount} ({args.period})")
             print(f"Budget ID: {budget_id}")
         except ValueError as e:
             print(f"Error: {e}")
 
-    def list_budgets(self, args):
+    def list_budgets(self, args: argparse.Namespace) -> None:
         """List all budgets."""
+        by_id, by_name = self.db.get_category_maps()
+
         category_id = None
         if args.category:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == args.category
-            ]
-            if not categories:
+            category_id = by_name.get(args.category)
+            if category_id is None:
                 print(f"Category '{args.category}' not found.")
                 return
-            category_id = categories[0].id
 
         budgets = self.db.get_budgets(
             category_id=category_id, is_active=None if args.include_inactive else True
@@ -549,59 +660,55 @@ Examples:
             print("No budgets found.")
             return
 
-        # Get category names
-        categories = {c.id: c.name for c in self.db.get_all_categories()}
-
-        print(
-            f"{'Category':<15} {'Amount':<12} {'Period':<10} {'Start Date':<12} {'Status':<8} {'ID':<10}"
-        )
-        print("-" * 75)
+        lines = [
+            f"{'Category':<15} {'Amount':<12} {'Period':<10} {'Start Date':<12} {'Status':<8} {'ID':<10}",
+            "-" * 75,
+        ]
 
         for budget in budgets:
-            category_name = categories.get(budget.category_id, "Unknown")
+            category_name = by_id.get(budget.category_id, "Unknown")
             if len(category_name) > 12:
                 category_name = category_name[:9] + "..."
 
             status = "Active" if budget.is_active else "Inactive"
             budget_id = budget.id[:8] + "..."
 
-            print(
-                f"{category_name:<15} "
-                f"${budget.amount:<11.2f} "
-                f"{budget.period:<10} "
-                f"{budget.start_date.strftime('%Y-%m-%d'):<12} "
-                f"{status:<8} "
-                f"{budget_id:<10}"
+            lines.append(
+                _BUDGET_ROW_FMT.format(
+                    c=category_name,
+                    a=budget.amount,
+                    p=budget.period,
+                    s=budget.start_date.strftime("%Y-%m-%d"),
+                    st=status,
+                    i=budget_id,
+                )
             )
+        write_lines(lines)
 
-    def budget_status(self, args):
+    def budget_status(self, args: argparse.Namespace) -> None:
         """Show budget status with spending analysis."""
+        by_id, by_name = self.db.get_category_maps()
+
         category_id = None
         if args.category:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == args.category
-            ]
-            if not categories:
+            category_id = by_name.get(args.category)
+            if category_id is None:
                 print(f"Category '{args.category}' not found.")
                 return
-            category_id = categories[0].id
 
-        budgets = self.db.get_budgets(category_id=category_id, is_active=True)
-        if not budgets:
+        summaries = self.db.get_all_budget_summaries(category_id=category_id)
+        if not summaries:
             print("No active budgets found.")
             return
 
-        # Get category names
-        categories = {c.id: c.name for c in self.db.get_all_categories()}
-
-        print(
-            f"{'Category':<15} {'Budget':<12} {'Spent':<12} {'Remaining':<12} {'%Used':<8} {'Status':<12}"
-        )
-        print("-" * 85)
+        lines = [
+            f"{'Category':<15} {'Budget':<12} {'Spent':<12} {'Remaining':<12} {'%Used':<8} {'Status':<12}",
+            "-" * 85,
+        ]
 
-        for budget in budgets:
-            summary = self.db.get_budget_summary(budget)
-            category_name = categories.get(budget.category_id, "Unknown")
+        for summary in summaries:
+            budget = summary.budget
+            category_name = by_id.get(budget.category_id, "Unknown")
             if len(category_name) > 12:
                 category_name = category_name[:9] + "..."
 
@@ -609,16 +716,22 @@ Examples:
             if summary.percentage_used > 80 and not summary.is_over_budget:
                 status = "Warning"
 
-            print(
-                f"{category_name:<15} "
-                f"${budget.amount:<11.2f} "
-                f"${summary.spent_amount:<11.2f} "
-                f"${summary.remaining_amount:<11.2f} "
-                f"{summary.percentage_used:<7.1f}% "
-                f"{status:<12}"
+            # Amounts carry two decimal places; render them as integer cents
+            budget_c = int(budget.amount * 100)
+            spent_c = int(summary.spent_amount * 100)
+            lines.append(
+                _STATUS_ROW_FMT.format(
+                    c=category_name,
+                    b=_format_cents(budget_c),
+                    s=_format_cents(spent_c),
+                    r=_format_cents(budget_c - spent_c),
+                    p=summary.percentage_used,
+                    st=status,
+                )
             )
+        write_lines(lines)
 
-    def delete_budget(self, args):
+    def delete_budget(self, args: argparse.Namespace) -> None:
         """Delete a budget."""
         budget = self.db.get_budget(args.budget_id)
         if not budget:
@@ -626,11 +739,10 @@ Examples:
             return
 
         if not args.force:
-            categories = {c.id: c.name for c in self.db.get_all_categories()}
-            category_name = categories.get(budget.category_id, "Unknown")
+            by_id, _ = self.db.get_category_maps()
+            category_name = by_id.get(budget.category_id, "Unknown")
             print(f"Budget: {category_name} - ${budget.amount} ({budget.period})")
-            confirm = input("Are you sure you want to delete this budget? (y/N): ")
-            if confirm.lower() != "y":
+            if not self._confirm("Are you sure you want to delete this budget?"):
                 print("Deletion cancelled.")
                 return
 
@@ -639,33 +751,51 @@ Examples:
         else:
             print("Failed to delete budget.")
 
-    def generate_report(self, args):
+    def generate_report(self, args: argparse.Namespace) -> None:
         """Generate financial reports."""
+        if self._rg is None:
+            from .reports import ReportGenerator
+
+            self._rg = ReportGenerator(self.db)
+        rg = self._rg
+
         try:
             if args.type == "monthly":
-                self.report_generator.monthly_report()
+                rg.monthly_report()
             elif args.type == "yearly":
-                self.report_generator.yearly_report()
+                rg.yearly_report()
             elif args.type == "summary":
-                self.report_generator.summary_report()
+                rg.summary_report()
             elif args.type == "custom":
-                start_date = None
-                end_date = None
-
-                if args.start_date:
-                    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
-                if args.end_date:
-                    end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
-
-                self.report_generator.custom_report(start_date, end_date, args.category)
+                rg.custom_report(args.start_date, args.end_date, args.category)
         except Exception as e:
             print(f"Error generating report: {e}")
 
-
-def main():
+    # Subcommand name -> handler, called as handler(self, args)
+    COMMAND_TABLE = {
+        "add-category": add_category,
+        "list-categories": list_categories,
+        "update-category": update_category,
+        "delete-category": delete_category,
+        "add-transaction": add_transaction,
+        "list-transactions": list_transactions,
+        "update-transaction": update_transaction,
+        "delete-transaction": delete_transaction,
+        "set-budget": set_budget,
+        "list-budgets": list_budgets,
+        "budget-status": budget_status,
+        "delete-budget": delete_budget,
+        "report": generate_report,
+    }
+
+
+def main() -> None:
     """Main entry point for the CLI application."""
     cli = BudgetManagerCLI()
-    cli.run()
+    try:
+        cli.run()
+    finally:
+        cli.close()
 
 
 if __name__ == "__main__":
@@ -10,49 +10,319 @@ GitHub: https://github.com/tara32473/budget-manager
 
 import os
 import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .models import Budget, BudgetSummary, Category, Transaction, TransactionType
 
+# Connection tuning applied once when the database is opened
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Fixed statements live at module level so every call passes the identical
+# string and hits the connection's prepared statement cache
+_STATEMENT_CACHE_SIZE = 256
+
+# TIMESTAMP columns hold "YYYY-MM-DD HH:MM:SS[.ffffff]" text. Values are
+# converted with isoformat(" ") and fromisoformat() where they are bound
+# and read, not through sqlite3's process-wide adapters and converters.
+
+# Explicit column lists fix the positions read by _row_to_category() and
+# _row_to_transaction(), which take plain tuple rows
+_CATEGORY_COLUMNS = "id, name, description, color, created_at"
+_TRANSACTION_COLUMNS = (
+    "id, amount, description, category_id, transaction_type, date, created_at, notes"
+)
+
+_SELECT_CATEGORY = f"SELECT {_CATEGORY_COLUMNS} FROM categories WHERE id = ?"
+_SELECT_CATEGORY_BY_NAME = f"SELECT {_CATEGORY_COLUMNS} FROM categories WHERE name = ?"
+_SELECT_ALL_CATEGORIES = f"SELECT {_CATEGORY_COLUMNS} FROM categories ORDER BY name"
+_DELETE_CATEGORY = "DELETE FROM categories WHERE id = ?"
+
+_SELECT_TRANSACTION = f"SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE id = ?"
+_DELETE_TRANSACTION = "DELETE FROM transactions WHERE id = ?"
+
+_SELECT_BUDGET = "SELECT * FROM budgets WHERE id = ?"
+_DELETE_BUDGET = "DELETE FROM budgets WHERE id = ?"
+
+_INSERT_CATEGORY = """
+    INSERT INTO categories (id, name, description, color, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_TRANSACTION = """
+    INSERT INTO transactions (id, amount, description, category_id,
+                              transaction_type, date, created_at, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_BUDGET = """
+    INSERT INTO budgets (id, category_id, amount, period,
+                         start_date, end_date, created_at, is_active)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE_CATEGORY = """
+    UPDATE categories
+    SET name = ?, description = ?, color = ?
+    WHERE id = ?
+"""
+
+_UPDATE_TRANSACTION = """
+    UPDATE transactions
+    SET amount = ?, description = ?, category_id = ?,
+        transaction_type = ?, date = ?, notes = ?
+    WHERE id = ?
+"""
+
+_UPDATE_BUDGET = """
+    UPDATE budgets
+    SET category_id = ?, amount = ?, period = ?,
+        start_date = ?, end_date = ?, is_active = ?
+    WHERE id = ?
+"""
+
+# Expense total (in cents) and count for one budget's category and period;
+# an open-ended budget has no upper date bound
+_BUDGET_SPENT = """
+    SELECT COALESCE(SUM(amount), 0), COUNT(*)
+    FROM transactions
+    WHERE category_id = ? AND transaction_type = 'expense'
+      AND date >= ? AND date <= COALESCE(?, '9999-12-31')
+"""
+
+# Bases of the filtered queries; the WHERE 1=1 lets filters append
+# "AND ..." clauses without tracking whether one came first
+_SELECT_TRANSACTIONS = f"SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE 1=1"
+
+_SELECT_TRANSACTIONS_WITH_CATEGORY = """
+    SELECT t.id, t.amount, t.description, t.category_id,
+           t.transaction_type, t.date, t.created_at, t.notes, c.name
+    FROM transactions t
+    LEFT JOIN categories c ON c.id = t.category_id
+    WHERE 1=1
+"""
+
+_SELECT_TRANSACTIONS_RAW = """
+    SELECT t.id, substr(t.date, 1, 10), t.transaction_type, t.amount,
+           c.name, t.description
+    FROM transactions t
+    LEFT JOIN categories c ON c.id = t.category_id
+    WHERE 1=1
+"""
+
+_SELECT_BUDGETS = "SELECT * FROM budgets WHERE 1=1"
+
+_SELECT_BUDGET_SUMMARIES = """
+    SELECT b.*, COALESCE(SUM(t.amount), 0) AS spent, COUNT(t.id) AS txn_count
+    FROM budgets b
+    LEFT JOIN transactions t ON t.category_id = b.category_id
+        AND t.transaction_type = 'expense'
+        AND t.date >= b.start_date
+        AND t.date <= COALESCE(b.end_date, '9999-12-31')
+    WHERE b.is_active = 1
+"""
+
+_SELECT_TYPE_TOTALS = """
+    SELECT transaction_type, COALESCE(SUM(amount), 0) as total
+    FROM transactions
+    WHERE 1=1
+"""
+
+_SELECT_TYPE_BREAKDOWN = """
+    SELECT transaction_type, SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE 1=1
+"""
+
+# Largest per-category expense totals in a date range, each row also
+# carrying the total over every category
+_TOP_SPENDING = """
+    WITH spent AS (
+        SELECT c.name AS name, SUM(t.amount) AS total
+        FROM transactions t
+        JOIN categories c ON c.id = t.category_id
+        WHERE t.transaction_type = 'expense'
+          AND t.date >= ? AND t.date <= ?
+        GROUP BY t.category_id
+    )
+    SELECT name, total, (SELECT SUM(total) FROM spent)
+    FROM spent
+    ORDER BY total DESC
+    LIMIT ?
+"""
+
+# Income and expense totals per month of a date range
+_MONTHLY_TOTALS = """
+    SELECT CAST(substr(date, 6, 2) AS INTEGER) AS month,
+           transaction_type, SUM(amount)
+    FROM transactions
+    WHERE date >= ? AND date <= ?
+    GROUP BY month, transaction_type
+"""
+
+# Schema revision stored in PRAGMA user_version. Version 1 stores money
+# columns as INTEGER cents instead of REAL; version 2 replaces the
+# single-column category/type indices with composite (column, date) ones;
+# version 3 folds the date index into the covering report index; version 4
+# drops the (category, date) index covered by the (category, type, date) one.
+_SCHEMA_VERSION = 4
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Convert a money amount to integer cents for storage."""
+    return int((amount * 100).to_integral_value())
+
 
 class DatabaseManager:
     """Manages database connections and operations."""
 
-    def __init__(self, db_path: str = None):
-        """Initialize database manager with optional custom path."""
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        uri: bool = False,
+        template: Optional["DatabaseManager"] = None,
+    ):
+        """Initialize database manager with optional custom path.
+
+        ``db_path`` may be ``":memory:"`` for a private in-memory database,
+        or an SQLite URI such as ``"file:name?mode=memory&cache=shared"``
+        when ``uri`` is true. With a ``template`` manager, its schema and
+        data are copied into the new database instead of building it.
+        """
         if db_path is None:
             # Default to data directory in project root
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
             db_path = os.path.join(project_root, "data", "budget_manager.db")
 
         self.db_path = db_path
-        self._ensure_db_directory()
+        self.uri = uri
+        # Bumped on every category write so lookups built from
+        # get_all_categories() can tell when they have gone stale
+        self.categories_version = 0
+        self._category_maps: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None
+        self._category_maps_version = -1
+        self._lock = threading.RLock()
+        if not uri:
+            self._ensure_db_directory()
+        self._conn = self._connect()
+        if template is not None:
+            with template.get_connection() as source:
+                source.backup(self._conn)
         self._initialize_database()
 
-    def _ensure_db_directory(self):
+    def _ensure_db_directory(self) -> None:
         """Ensure the database directory exists."""
         db_dir = os.path.dirname(self.db_path)
-        if not os.path.exists(db_dir):
+        if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune the connection shared by all operations."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            uri=self.uri,
+        )
+        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        # Closes the connection if the manager is collected or the
+        # interpreter exits first, without keeping the manager alive
+        self._finalizer = weakref.finalize(self, conn.close)
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection; later calls do nothing."""
+        if not self._finalizer.alive:
+            return
+        try:
+            # Refresh planner statistics for indices whose usage warrants it
+            self._conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        finally:
+            self._finalizer()
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        """Context manager giving exclusive use of the shared connection."""
+        with self._lock:
+            yield self._conn
+
+    def begin(self) -> None:
+        """Start a transaction grouping all writes until commit()/rollback().
+
+        The connection stays reserved for the calling thread meanwhile.
+        """
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN")
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def commit(self) -> None:
+        """Commit the transaction started with begin()."""
+        try:
+            self._conn.commit()
+        finally:
+            self._lock.release()
+
+    def rollback(self) -> None:
+        """Roll back the transaction started with begin()."""
+        self._discard_caches()
         try:
-            yield conn
+            self._conn.rollback()
         finally:
-            conn.close()
+            self._lock.release()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run every write in the block as one transaction (a single sync).
+
+        Rolls back if the block raises. Inside begin() or another batch()
+        the writes simply join the outer transaction.
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                yield
+                return
+            conn.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                conn.rollback()
+                self._discard_caches()
+                raise
+            conn.commit()
+
+    def _discard_caches(self) -> None:
+        """Invalidate category lookups built from rolled back writes."""
+        self.categories_version += 1
 
     def _initialize_database(self):
         """Create database tables if they don't exist."""
-        with self.get_connection() as conn:
+        with self.get_connection() as conn, self.batch():
             cursor = conn.cursor()
 
+            # Databases at the current version already have every table and
+            # index below; any schema change must bump _SCHEMA_VERSION
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= _SCHEMA_VERSION:
+                return
+
             # Categories table
             cursor.execute(
                 """
@@ -71,7 +341,7 @@ class DatabaseManager:
                 """
                 CREATE TABLE IF NOT EXISTS transactions (
                     id TEXT PRIMARY KEY,
-                    amount DECIMAL(10,2) NOT NULL,
+                    amount INTEGER NOT NULL,
                     description TEXT NOT NULL,
                     category_id TEXT,
                     transaction_type TEXT NOT NULL,
@@ -89,7 +359,7 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS budgets (
                     id TEXT PRIMARY KEY,
                     category_id TEXT NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL,
+                    amount INTEGER NOT NULL,
                     period TEXT NOT NULL DEFAULT 'monthly',
                     start_date TIMESTAMP NOT NULL,
                     end_date TIMESTAMP,
@@ -101,14 +371,23 @@ class DatabaseManager:
             )
 
             # Create indices for better performance
+            # Date-range report aggregates read only these columns, so they
+            # are answered from the index without visiting the table
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date)"
+                "CREATE INDEX IF NOT EXISTS idx_txn_date_type_cat "
+                "ON transactions(date, transaction_type, category_id, amount)"
             )
+            # Filter column first, then date, so type listings come back
+            # already in ORDER BY date order without a separate sort
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category_id)"
+                "CREATE INDEX IF NOT EXISTS idx_tx_type_date "
+                "ON transactions(transaction_type, date)"
             )
+            # Lets the per-budget expense aggregate run as a single index range
+            # scan; category listings also look up their rows through it
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(transaction_type)"
+                "CREATE INDEX IF NOT EXISTS idx_tx_cat_type_date "
+                "ON transactions(category_id, transaction_type, date)"
             )
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_budgets_category ON budgets(category_id)"
@@ -117,83 +396,135 @@ class DatabaseManager:
                 "CREATE INDEX IF NOT EXISTS idx_budgets_dates ON budgets(start_date, end_date)"
             )
 
-            conn.commit()
+            if version < 1:
+                # Databases created before version 1 hold REAL amounts
+                for table in ("transactions", "budgets"):
+                    cursor.execute(
+                        f"UPDATE {table} "
+                        "SET amount = CAST(ROUND(amount * 100) AS INTEGER)"
+                    )
+            if version < 2:
+                # Single-column indices superseded by the (column, date) ones
+                cursor.execute("DROP INDEX IF EXISTS idx_transactions_category")
+                cursor.execute("DROP INDEX IF EXISTS idx_transactions_type")
+            if version < 3:
+                # Prefix of idx_txn_date_type_cat
+                cursor.execute("DROP INDEX IF EXISTS idx_transactions_date")
+            if version < 4:
+                # Overlaps idx_tx_cat_type_date
+                cursor.execute("DROP INDEX IF EXISTS idx_tx_cat_date")
+            # Give the planner statistics for the indices just created;
+            # close() keeps them fresh afterwards with PRAGMA optimize
+            cursor.execute("ANALYZE")
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
 
     # Category operations
     def create_category(self, category: Category) -> str:
         """Create a new category."""
+        self.categories_version += 1
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO categories (id, name, description, color, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    category.id,
-                    category.name,
-                    category.description,
-                    category.color,
-                    category.created_at,
-                ),
-            )
-            conn.commit()
+            cursor.execute(_INSERT_CATEGORY, self._category_params(category))
             return category.id
 
+    def create_categories_bulk(self, categories: List[Category]) -> List[str]:
+        """Create many categories in a single database transaction."""
+        self.categories_version += 1
+        with self.batch():
+            self._conn.executemany(
+                _INSERT_CATEGORY, [self._category_params(c) for c in categories]
+            )
+        return [c.id for c in categories]
+
+    @staticmethod
+    def _category_params(category: Category) -> tuple:
+        """Column values for inserting a category."""
+        return (
+            category.id,
+            category.name,
+            category.description,
+            category.color,
+            category.created_at.isoformat(" "),
+        )
+
+    @staticmethod
+    def _row_to_category(row: tuple) -> Category:
+        """Build a Category from a row selected with _CATEGORY_COLUMNS."""
+        return Category(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            color=row[3],
+            created_at=datetime.fromisoformat(row[4]),
+        )
+
     def get_category(self, category_id: str) -> Optional[Category]:
         """Get a category by ID."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
+            cursor.row_factory = None
+            cursor.execute(_SELECT_CATEGORY, (category_id,))
             row = cursor.fetchone()
             if row:
-                return Category(
-                    id=row["id"],
-                    name=row["name"],
-                    description=row["description"],
-                    color=row["color"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                )
+                return self._row_to_category(row)
+            return None
+
+    def get_category_by_name(self, name: str) -> Optional[Category]:
+        """Get a category by its (unique) name."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            # Served by the index backing the UNIQUE constraint on name
+            cursor.execute(_SELECT_CATEGORY_BY_NAME, (name,))
+            row = cursor.fetchone()
+            if row:
+                return self._row_to_category(row)
             return None
 
     def get_all_categories(self) -> List[Category]:
         """Get all categories."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM categories ORDER BY name")
-            rows = cursor.fetchall()
-            return [
-                Category(
-                    id=row["id"],
-                    name=row["name"],
-                    description=row["description"],
-                    color=row["color"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
+            cursor.row_factory = None
+            cursor.execute(_SELECT_ALL_CATEGORIES)
+            return [self._row_to_category(row) for row in cursor]
+
+    def get_category_maps(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Return ``(by_id, by_name)`` category maps, rebuilt on changes.
+
+        ``by_id`` maps category id to name and ``by_name`` maps name to id.
+        The maps are shared between callers and must not be modified.
+        """
+        with self._lock:
+            if (
+                self._category_maps is None
+                or self._category_maps_version != self.categories_version
+            ):
+                categories = self.get_all_categories()
+                self._category_maps = (
+                    {c.id: c.name for c in categories},
+                    {c.name: c.id for c in categories},
                 )
-                for row in rows
-            ]
+                self._category_maps_version = self.categories_version
+            return self._category_maps
 
     def update_category(self, category: Category) -> bool:
         """Update an existing category."""
+        self.categories_version += 1
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                UPDATE categories 
-                SET name = ?, description = ?, color = ?
-                WHERE id = ?
-            """,
+                _UPDATE_CATEGORY,
                 (category.name, category.description, category.color, category.id),
             )
-            conn.commit()
             return cursor.rowcount > 0
 
     def delete_category(self, category_id: str) -> bool:
         """Delete a category."""
+        self.categories_version += 1
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-            conn.commit()
+            cursor.execute(_DELETE_CATEGORY, (category_id,))
             return cursor.rowcount > 0
 
     # Transaction operations
@@ -201,128 +532,208 @@ class DatabaseManager:
         """Create a new transaction."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO transactions (id, amount, description, category_id, 
-                                        transaction_type, date, created_at, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    transaction.id,
-                    float(transaction.amount),
-                    transaction.description,
-                    transaction.category_id,
-                    transaction.transaction_type.value,
-                    transaction.date,
-                    transaction.created_at,
-                    transaction.notes,
-                ),
-            )
-            conn.commit()
+            cursor.execute(_INSERT_TRANSACTION, self._transaction_params(transaction))
             return transaction.id
 
+    def create_transactions_bulk(self, transactions: List[Transaction]) -> List[str]:
+        """Create many transactions in a single database transaction."""
+        with self.batch():
+            self._conn.executemany(
+                _INSERT_TRANSACTION,
+                [self._transaction_params(t) for t in transactions],
+            )
+        return [t.id for t in transactions]
+
+    @staticmethod
+    def _transaction_params(transaction: Transaction) -> tuple:
+        """Column values for inserting a transaction."""
+        return (
+            transaction.id,
+            _to_cents(transaction.amount),
+            transaction.description,
+            transaction.category_id,
+            transaction.transaction_type.value,
+            transaction.date.isoformat(" "),
+            transaction.created_at.isoformat(" "),
+            transaction.notes,
+        )
+
+    @staticmethod
+    def _row_to_transaction(row: tuple) -> Transaction:
+        """Build a Transaction from a row selected with _TRANSACTION_COLUMNS."""
+        return Transaction(
+            id=row[0],
+            amount=Decimal(row[1]).scaleb(-2),
+            description=row[2],
+            category_id=row[3],
+            transaction_type=TransactionType(row[4]),
+            date=datetime.fromisoformat(row[5]),
+            created_at=datetime.fromisoformat(row[6]),
+            notes=row[7],
+        )
+
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Get a transaction by ID."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
+            cursor.row_factory = None
+            cursor.execute(_SELECT_TRANSACTION, (transaction_id,))
             row = cursor.fetchone()
             if row:
-                return Transaction(
-                    id=row["id"],
-                    amount=Decimal(str(row["amount"])),
-                    description=row["description"],
-                    category_id=row["category_id"],
-                    transaction_type=TransactionType(row["transaction_type"]),
-                    date=datetime.fromisoformat(row["date"]),
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    notes=row["notes"],
-                )
+                return self._row_to_transaction(row)
             return None
 
-    def get_transactions(
+    @staticmethod
+    def _transaction_filters(
+        category_id: Optional[str],
+        transaction_type: Optional[TransactionType],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: Optional[int],
+        alias: str = "",
+    ) -> Tuple[str, List[Any]]:
+        """Build the filter/ORDER BY/LIMIT tail shared by transaction listings.
+
+        ``alias`` prefixes column names (e.g. ``"t."``) for joined queries.
+        """
+        query = ""
+        params: List[Any] = []
+
+        if category_id:
+            query += f" AND {alias}category_id = ?"
+            params.append(category_id)
+
+        if transaction_type:
+            query += f" AND {alias}transaction_type = ?"
+            params.append(transaction_type.value)
+
+        if start_date:
+            query += f" AND {alias}date >= ?"
+            params.append(start_date.isoformat(" "))
+
+        if end_date:
+            query += f" AND {alias}date <= ?"
+            params.append(end_date.isoformat(" "))
+
+        query += f" ORDER BY {alias}date DESC"
+
+        if limit:
+            # Bound rather than interpolated so the SQL text, and therefore
+            # the cached prepared statement, is the same for every limit
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return query, params
+
+    def iter_transactions(
         self,
-        category_id: str = None,
-        transaction_type: TransactionType = None,
-        start_date: datetime = None,
-        end_date: datetime = None,
-        limit: int = None,
-    ) -> List[Transaction]:
-        """Get transactions with optional filters."""
+        category_id: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Transaction]:
+        """Yield transactions matching the filters straight from the cursor.
+
+        The connection stays reserved for the calling thread until the
+        iterator is exhausted or closed.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
+            tail, params = self._transaction_filters(
+                category_id, transaction_type, start_date, end_date, limit
+            )
+            for row in cursor.execute(_SELECT_TRANSACTIONS + tail, params):
+                yield self._row_to_transaction(row)
 
-            query = "SELECT * FROM transactions WHERE 1=1"
-            params = []
-
-            if category_id:
-                query += " AND category_id = ?"
-                params.append(category_id)
+    def get_transactions(
+        self,
+        category_id: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Transaction]:
+        """Get transactions with optional filters."""
+        return list(
+            self.iter_transactions(
+                category_id, transaction_type, start_date, end_date, limit
+            )
+        )
 
-            if transaction_type:
-                query += " AND transaction_type = ?"
-                params.append(transaction_type.value)
+    def get_transactions_with_category_name(
+        self,
+        category_id: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Transaction, Optional[str]]]:
+        """Get filtered transactions paired with their category name.
 
-            if start_date:
-                query += " AND date >= ?"
-                params.append(start_date)
+        The category name is resolved with a LEFT JOIN, so it is None for
+        uncategorized transactions.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
 
-            if end_date:
-                query += " AND date <= ?"
-                params.append(end_date)
+            tail, params = self._transaction_filters(
+                category_id, transaction_type, start_date, end_date, limit, alias="t."
+            )
+            cursor.execute(_SELECT_TRANSACTIONS_WITH_CATEGORY + tail, params)
+            return [(self._row_to_transaction(row), row[8]) for row in cursor]
 
-            query += " ORDER BY date DESC"
+    def get_transactions_raw(
+        self,
+        category_id: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, str, str, int, Optional[str], str]]:
+        """Get filtered transactions as plain tuples for display.
 
-            if limit:
-                query += f" LIMIT {limit}"
+        Each row is ``(id, date, type, amount_cents, category_name,
+        description)`` with the date as ``YYYY-MM-DD`` and the amount in
+        integer cents, so no model objects or Decimals are created.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
 
-            cursor.execute(query, params)
+            tail, params = self._transaction_filters(
+                category_id, transaction_type, start_date, end_date, limit, alias="t."
+            )
+            cursor.execute(_SELECT_TRANSACTIONS_RAW + tail, params)
+            rows: List[Tuple[str, str, str, int, Optional[str], str]]
             rows = cursor.fetchall()
-
-            return [
-                Transaction(
-                    id=row["id"],
-                    amount=Decimal(str(row["amount"])),
-                    description=row["description"],
-                    category_id=row["category_id"],
-                    transaction_type=TransactionType(row["transaction_type"]),
-                    date=datetime.fromisoformat(row["date"]),
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    notes=row["notes"],
-                )
-                for row in rows
-            ]
+            return rows
 
     def update_transaction(self, transaction: Transaction) -> bool:
         """Update an existing transaction."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                UPDATE transactions 
-                SET amount = ?, description = ?, category_id = ?, 
-                    transaction_type = ?, date = ?, notes = ?
-                WHERE id = ?
-            """,
+                _UPDATE_TRANSACTION,
                 (
-                    float(transaction.amount),
+                    _to_cents(transaction.amount),
                     transaction.description,
                     transaction.category_id,
                     transaction.transaction_type.value,
-                    transaction.date,
+                    transaction.date.isoformat(" "),
                     transaction.notes,
                     transaction.id,
                 ),
             )
-            conn.commit()
             return cursor.rowcount > 0
 
     def delete_transaction(self, transaction_id: str) -> bool:
         """Delete a transaction."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-            conn.commit()
+            cursor.execute(_DELETE_TRANSACTION, (transaction_id,))
             return cursor.rowcount > 0
 
     # Budget operations
@@ -330,57 +741,65 @@ class DatabaseManager:
         """Create a new budget."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO budgets (id, category_id, amount, period, 
-                                   start_date, end_date, created_at, is_active)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    budget.id,
-                    budget.category_id,
-                    float(budget.amount),
-                    budget.period,
-                    budget.start_date,
-                    budget.end_date,
-                    budget.created_at,
-                    budget.is_active,
-                ),
-            )
-            conn.commit()
+            cursor.execute(_INSERT_BUDGET, self._budget_params(budget))
             return budget.id
 
+    def create_budgets_bulk(self, budgets: List[Budget]) -> List[str]:
+        """Create many budgets in a single database transaction."""
+        with self.batch():
+            self._conn.executemany(
+                _INSERT_BUDGET, [self._budget_params(b) for b in budgets]
+            )
+        return [b.id for b in budgets]
+
+    @staticmethod
+    def _budget_params(budget: Budget) -> tuple:
+        """Column values for inserting a budget."""
+        return (
+            budget.id,
+            budget.category_id,
+            _to_cents(budget.amount),
+            budget.period,
+            budget.start_date.isoformat(" "),
+            budget.end_date.isoformat(" ") if budget.end_date else None,
+            budget.created_at.isoformat(" "),
+            budget.is_active,
+        )
+
+    @staticmethod
+    def _row_to_budget(row: sqlite3.Row) -> Budget:
+        """Build a Budget from a budgets table row."""
+        return Budget(
+            id=row["id"],
+            category_id=row["category_id"],
+            amount=Decimal(row["amount"]).scaleb(-2),
+            period=row["period"],
+            start_date=datetime.fromisoformat(row["start_date"]),
+            end_date=(
+                datetime.fromisoformat(row["end_date"]) if row["end_date"] else None
+            ),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            is_active=bool(row["is_active"]),
+        )
+
     def get_budget(self, budget_id: str) -> Optional[Budget]:
         """Get a budget by ID."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM budgets WHERE id = ?", (budget_id,))
+            cursor.execute(_SELECT_BUDGET, (budget_id,))
             row = cursor.fetchone()
             if row:
-                return Budget(
-                    id=row["id"],
-                    category_id=row["category_id"],
-                    amount=Decimal(str(row["amount"])),
-                    period=row["period"],
-                    start_date=datetime.fromisoformat(row["start_date"]),
-                    end_date=(
-                        datetime.fromisoformat(row["end_date"])
-                        if row["end_date"]
-                        else None
-                    ),
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    is_active=bool(row["is_active"]),
-                )
+                return self._row_to_budget(row)
             return None
 
     def get_budgets(
-        self, category_id: str = None, is_active: bool = True
+        self, category_id: Optional[str] = None, is_active: bool = True
     ) -> List[Budget]:
         """Get budgets with optional filters."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            query = "SELECT * FROM budgets WHERE 1=1"
+            query = _SELECT_BUDGETS
             params = []
 
             if category_id:
@@ -396,135 +815,220 @@ class DatabaseManager:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-            return [
-                Budget(
-                    id=row["id"],
-                    category_id=row["category_id"],
-                    amount=Decimal(str(row["amount"])),
-                    period=row["period"],
-                    start_date=datetime.fromisoformat(row["start_date"]),
-                    end_date=(
-                        datetime.fromisoformat(row["end_date"])
-                        if row["end_date"]
-                        else None
-                    ),
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    is_active=bool(row["is_active"]),
-                )
-                for row in rows
-            ]
+            return [self._row_to_budget(row) for row in rows]
 
     def update_budget(self, budget: Budget) -> bool:
         """Update an existing budget."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                UPDATE budgets 
-                SET category_id = ?, amount = ?, period = ?, 
-                    start_date = ?, end_date = ?, is_active = ?
-                WHERE id = ?
-            """,
+                _UPDATE_BUDGET,
                 (
                     budget.category_id,
-                    float(budget.amount),
+                    _to_cents(budget.amount),
                     budget.period,
-                    budget.start_date,
-                    budget.end_date,
+                    budget.start_date.isoformat(" "),
+                    budget.end_date.isoformat(" ") if budget.end_date else None,
                     budget.is_active,
                     budget.id,
                 ),
             )
-            conn.commit()
             return cursor.rowcount > 0
 
     def delete_budget(self, budget_id: str) -> bool:
         """Delete a budget."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM budgets WHERE id = ?", (budget_id,))
-            conn.commit()
+            cursor.execute(_DELETE_BUDGET, (budget_id,))
             return cursor.rowcount > 0
 
     # Analytics and reporting methods
     def get_budget_summary(self, budget: Budget) -> BudgetSummary:
         """Get a summary of budget performance."""
-        # Get transactions for the budget period
-        transactions = self.get_transactions(
-            category_id=budget.category_id,
-            transaction_type=TransactionType.EXPENSE,
-            start_date=budget.start_date,
-            end_date=budget.end_date,
-        )
-
-        spent_amount = sum(t.amount for t in transactions)
+        with self.get_connection() as conn:
+            spent_cents, count = conn.execute(
+                _BUDGET_SPENT,
+                (
+                    budget.category_id,
+                    budget.start_date.isoformat(" "),
+                    budget.end_date.isoformat(" ") if budget.end_date else None,
+                ),
+            ).fetchone()
 
         return BudgetSummary(
             budget=budget,
-            spent_amount=spent_amount,
-            transaction_count=len(transactions),
+            spent_amount=Decimal(spent_cents).scaleb(-2),
+            transaction_count=count,
         )
 
+    def get_all_budget_summaries(
+        self, category_id: Optional[str] = None
+    ) -> List[BudgetSummary]:
+        """Get summaries for all active budgets with a single query."""
+        query = _SELECT_BUDGET_SUMMARIES
+        params = []
+        if category_id:
+            query += " AND b.category_id = ?"
+            params.append(category_id)
+        query += " GROUP BY b.id ORDER BY b.created_at DESC"
+
+        with self.get_connection() as conn:
+            return [
+                BudgetSummary(
+                    budget=self._row_to_budget(row),
+                    spent_amount=Decimal(row["spent"]).scaleb(-2),
+                    transaction_count=row["txn_count"],
+                )
+                for row in conn.execute(query, params)
+            ]
+
     def get_spending_by_category(
-        self, start_date: datetime = None, end_date: datetime = None
-    ) -> Dict[str, Decimal]:
-        """Get spending totals by category."""
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Tuple[Dict[str, Decimal], Decimal]:
+        """Get spending totals by category, plus the total over all of them."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            query = """
+            # The date bounds belong to the join condition, not a WHERE
+            # clause: categories without spending in the range must still
+            # be listed with a zero total. The join is served by
+            # idx_tx_cat_type_date.
+            join_on = "c.id = t.category_id AND t.transaction_type = 'expense'"
+            params = []
+
+            if start_date:
+                join_on += " AND t.date >= ?"
+                params.append(start_date.isoformat(" "))
+            if end_date:
+                join_on += " AND t.date <= ?"
+                params.append(end_date.isoformat(" "))
+
+            query = f"""
                 SELECT c.name, COALESCE(SUM(t.amount), 0) as total
                 FROM categories c
-                LEFT JOIN transactions t ON c.id = t.category_id 
-                    AND t.transaction_type = 'expense'
+                LEFT JOIN transactions t ON {join_on}
+                GROUP BY c.id, c.name
+                ORDER BY total DESC
             """
-            params = []
 
-            if start_date or end_date:
-                if start_date:
-                    query += " AND t.date >= ?"
-                    params.append(start_date)
-                if end_date:
-                    query += " AND t.date <= ?"
-                    params.append(end_date)
+            # Plain tuples: SQLite sums integer cents, converted once per row;
+            # the grand total is added up in cents while walking the rows
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            spending = {}
+            grand_total = 0
+            for name, total in cursor:
+                spending[name] = Decimal(total).scaleb(-2)
+                grand_total += total
+            return spending, Decimal(grand_total).scaleb(-2)
 
-            query += " GROUP BY c.id, c.name ORDER BY total DESC"
+    def get_top_spending_categories(
+        self, start_date: datetime, end_date: datetime, limit: int = 10
+    ) -> Tuple[List[Tuple[str, Decimal]], Decimal]:
+        """Get the categories with the highest spending, largest first.
 
-            cursor.execute(query, params)
+        Returns up to ``limit`` ``(name, total)`` pairs for categories with
+        spending in the range, plus the total over all categories.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                _TOP_SPENDING,
+                (start_date.isoformat(" "), end_date.isoformat(" "), limit),
+            )
             rows = cursor.fetchall()
 
-            return {row["name"]: Decimal(str(row["total"])) for row in rows}
+        if not rows:
+            return [], Decimal("0")
+        top = [(name, Decimal(total).scaleb(-2)) for name, total, _ in rows]
+        return top, Decimal(rows[0][2]).scaleb(-2)
 
     def get_income_vs_expenses(
-        self, start_date: datetime = None, end_date: datetime = None
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
     ) -> Dict[str, Decimal]:
         """Get total income vs expenses."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            query = """
-                SELECT transaction_type, COALESCE(SUM(amount), 0) as total
-                FROM transactions
-                WHERE 1=1
-            """
+            query = _SELECT_TYPE_TOTALS
             params = []
 
             if start_date:
                 query += " AND date >= ?"
-                params.append(start_date)
+                params.append(start_date.isoformat(" "))
 
             if end_date:
                 query += " AND date <= ?"
-                params.append(end_date)
+                params.append(end_date.isoformat(" "))
 
             query += " GROUP BY transaction_type"
 
+            cursor.row_factory = None
             cursor.execute(query, params)
-            rows = cursor.fetchall()
 
             result = {"income": Decimal("0"), "expense": Decimal("0")}
-            for row in rows:
-                result[row["transaction_type"]] = Decimal(str(row["total"]))
+            for transaction_type, total in cursor:
+                result[transaction_type] = Decimal(total).scaleb(-2)
 
             result["net"] = result["income"] - result["expense"]
             return result
+
+    def get_monthly_income_vs_expenses(
+        self, year: int
+    ) -> Dict[int, Dict[str, Decimal]]:
+        """Get income vs expenses for each month of a year in one query.
+
+        Returns a dict keyed by month number (1-12) with the same
+        ``income``/``expense``/``net`` entries as get_income_vs_expenses().
+        """
+        months = {
+            month: {"income": Decimal("0"), "expense": Decimal("0")}
+            for month in range(1, 13)
+        }
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                _MONTHLY_TOTALS,
+                (f"{year:04d}-01-01 00:00:00", f"{year:04d}-12-31 23:59:59"),
+            )
+            for month, transaction_type, total in cursor:
+                months[month][transaction_type] = Decimal(total).scaleb(-2)
+
+        for totals in months.values():
+            totals["net"] = totals["income"] - totals["expense"]
+        return months
+
+    def get_type_breakdown(
+        self,
+        category_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Tuple[Decimal, int]]:
+        """Get the total amount and number of transactions per type."""
+        query = _SELECT_TYPE_BREAKDOWN
+        params = []
+
+        if category_id:
+            query += " AND category_id = ?"
+            params.append(category_id)
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date.isoformat(" "))
+
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date.isoformat(" "))
+
+        query += " GROUP BY transaction_type"
+
+        result = {"income": (Decimal("0"), 0), "expense": (Decimal("0"), 0)}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            for transaction_type, total, count in cursor:
+                result[transaction_type] = (Decimal(total).scaleb(-2), count)
+        return result
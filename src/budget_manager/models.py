@@ -10,12 +10,46 @@ Author: tara32473
 GitHub: https://github.com/tara32473/budget-manager
 """
 
+import sys
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
+
+# Slotted instances drop the per-object __dict__; dataclass(slots=True)
+# needs Python 3.10+, older interpreters keep regular instances
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _new_id() -> str:
+    """Generate a random primary key as 32 hex digits (no dashes)."""
+    return uuid.uuid4().hex
+
+
+# Quantum for money amounts (two decimal places)
+_Q2 = Decimal("0.01")
+
+
+def _to_money(amount: Union[Decimal, float, int, str]) -> Decimal:
+    """Return amount as a Decimal with exactly two decimal places."""
+    # Amounts read back from the database already have this shape
+    if isinstance(amount, Decimal) and amount.as_tuple().exponent == -2:
+        return amount
+    return Decimal(str(amount)).quantize(_Q2)
+
+
+# Default budget end for each period, computed from the start date
+_PERIOD_END = {
+    # First day of the following month
+    "monthly": lambda start: start.replace(
+        year=start.year + start.month // 12, month=start.month % 12 + 1, day=1
+    ),
+    "weekly": lambda start: start + timedelta(days=7),
+    # First day of the following year
+    "yearly": lambda start: start.replace(year=start.year + 1, month=1, day=1),
+}
 
 
 class TransactionType(Enum):
@@ -25,11 +59,11 @@ class TransactionType(Enum):
     EXPENSE = "expense"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Category:
     """Represents a spending or income category."""
 
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     name: str = ""
     description: Optional[str] = None
     color: Optional[str] = None
@@ -40,11 +74,11 @@ class Category:
             raise ValueError("Category name is required")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Transaction:
     """Represents a financial transaction (income or expense)."""
 
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     amount: Decimal = Decimal("0.00")
     description: str = ""
     category_id: Optional[str] = None
@@ -59,14 +93,14 @@ class Transaction:
         if self.amount <= 0:
             raise ValueError("Transaction amount must be positive")
         # Ensure amount is a Decimal with 2 decimal places
-        self.amount = Decimal(str(self.amount)).quantize(Decimal("0.01"))
+        self.amount = _to_money(self.amount)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Budget:
     """Represents a budget limit for a category."""
 
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     category_id: str = ""
     amount: Decimal = Decimal("0.00")
     period: str = "monthly"  # monthly, weekly, yearly
@@ -81,33 +115,16 @@ class Budget:
         if self.amount <= 0:
             raise ValueError("Budget amount must be positive")
         # Ensure amount is a Decimal with 2 decimal places
-        self.amount = Decimal(str(self.amount)).quantize(Decimal("0.01"))
+        self.amount = _to_money(self.amount)
 
         # Set default end_date based on period if not provided
         if not self.end_date:
-            if self.period == "monthly":
-                # Set to end of the month
-                if self.start_date.month == 12:
-                    self.end_date = self.start_date.replace(
-                        year=self.start_date.year + 1, month=1, day=1
-                    )
-                else:
-                    self.end_date = self.start_date.replace(
-                        month=self.start_date.month + 1, day=1
-                    )
-            elif self.period == "weekly":
-                # Set to 7 days from start
-                from datetime import timedelta
-
-                self.end_date = self.start_date + timedelta(days=7)
-            elif self.period == "yearly":
-                # Set to end of the year
-                self.end_date = self.start_date.replace(
-                    year=self.start_date.year + 1, month=1, day=1
-                )
-
-
-@dataclass
+            period_end = _PERIOD_END.get(self.period)
+            if period_end:
+                self.end_date = period_end(self.start_date)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class BudgetSummary:
     """Summary of budget performance."""
 
@@ -16,10 +16,56 @@ import json
 from calendar import monthrange
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
 
+from ._output import write_lines
 from .database import DatabaseManager
-from .models import TransactionType
+
+# Write buffer for exported files, so rows reach the OS in large chunks
+_EXPORT_BUFFER_SIZE = 1 << 16
+
+# Category rows as "name  $amount (share%)", pre-built %-format templates;
+# the share is passed already formatted (see _category_lines)
+_CATEGORY_ROW = "  %-20s $%8.2f (%5s%%)"
+_TOP_CATEGORY_ROW = "  %-25s $%10.2f (%5s%%)"
+
+# English month names indexed by month - 1, independent of the process locale
+_MONTH_FULL = (
+    "January February March April May June July"
+    " August September October November December"
+).split()
+_MONTH_ABBR = [name[:3] for name in _MONTH_FULL]
+
+
+def _rank_spending(
+    spending_by_category: Dict[str, Decimal],
+) -> List[Tuple[str, Decimal]]:
+    """Return the ``(category, amount)`` pairs, largest first."""
+    return sorted(spending_by_category.items(), key=itemgetter(1), reverse=True)
+
+
+def _category_lines(
+    ranked: List[Tuple[str, Decimal]], total: Decimal, row_format: str
+) -> List[str]:
+    """Format the categories with spending, each with its share of total."""
+    if total <= 0:
+        return []
+    # %-formatting converts the amounts to float, which is exact for two
+    # decimal places. The share stays a Decimal so that values ending in 5
+    # round half-even, e.g. 0.95% shows as 1.0% and 0.65% as 0.6%.
+    return [
+        row_format % (category, amount, format(amount / total * 100, ".1f"))
+        for category, amount in ranked
+        if amount > 0
+    ]
+
+
+def _json_default(obj: Any) -> float:
+    """Serialize values the json module does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class ReportGenerator:
@@ -31,6 +77,7 @@ class ReportGenerator:
 
     def monthly_report(self, year: int = None, month: int = None) -> Dict[str, Any]:
         """Generate a comprehensive monthly report."""
+        out = []
         if year is None:
             year = datetime.now().year
         if month is None:
@@ -41,150 +88,140 @@ class ReportGenerator:
         _, last_day = monthrange(year, month)
         end_date = datetime(year, month, last_day, 23, 59, 59)
 
-        print(f"\n📊 Monthly Report for {start_date.strftime('%B %Y')}")
-        print("=" * 60)
+        period = f"{_MONTH_FULL[month - 1]} {year}"
+        out.append(f"\n📊 Monthly Report for {period}")
+        out.append("=" * 60)
 
         # Income vs Expenses
         income_expense = self.db.get_income_vs_expenses(start_date, end_date)
-        print(f"\n💰 Financial Summary:")
-        print(f"  Income:     ${income_expense['income']:>10.2f}")
-        print(f"  Expenses:   ${income_expense['expense']:>10.2f}")
-        print(f"  Net:        ${income_expense['net']:>10.2f}")
+        out.append(f"\n💰 Financial Summary:")
+        out.append(f"  Income:     ${income_expense['income']:>10.2f}")
+        out.append(f"  Expenses:   ${income_expense['expense']:>10.2f}")
+        out.append(f"  Net:        ${income_expense['net']:>10.2f}")
 
         if income_expense["net"] >= 0:
-            print("  Status:     ✅ Positive cash flow")
+            out.append("  Status:     ✅ Positive cash flow")
         else:
-            print("  Status:     ⚠️  Negative cash flow")
+            out.append("  Status:     ⚠️  Negative cash flow")
 
         # Spending by category
-        spending_by_category = self.db.get_spending_by_category(start_date, end_date)
+        spending_by_category, total_spending = self.db.get_spending_by_category(
+            start_date, end_date
+        )
         if spending_by_category:
-            print(f"\n📈 Spending by Category:")
-            total_spending = sum(spending_by_category.values())
-            for category, amount in sorted(
-                spending_by_category.items(), key=lambda x: x[1], reverse=True
-            ):
-                if amount > 0:
-                    percentage = (
-                        (amount / total_spending * 100) if total_spending > 0 else 0
-                    )
-                    print(f"  {category:<20} ${amount:>8.2f} ({percentage:>5.1f}%)")
+            out.append(f"\n📈 Spending by Category:")
+            ranked = _rank_spending(spending_by_category)
+            out.extend(_category_lines(ranked, total_spending, _CATEGORY_ROW))
 
         # Budget performance
-        self._show_budget_performance(start_date, end_date)
+        self._show_budget_performance(start_date, end_date, out)
 
-        # Transaction count
-        transactions = self.db.get_transactions(
-            start_date=start_date, end_date=end_date
-        )
-        income_count = len(
-            [t for t in transactions if t.transaction_type == TransactionType.INCOME]
-        )
-        expense_count = len(
-            [t for t in transactions if t.transaction_type == TransactionType.EXPENSE]
-        )
+        # Transaction count, aggregated in SQL
+        breakdown = self.db.get_type_breakdown(start_date=start_date, end_date=end_date)
+        income_count = breakdown["income"][1]
+        expense_count = breakdown["expense"][1]
+        transaction_count = income_count + expense_count
 
-        print(f"\n📝 Transaction Summary:")
-        print(f"  Total transactions: {len(transactions)}")
-        print(f"  Income entries:     {income_count}")
-        print(f"  Expense entries:    {expense_count}")
+        out.append(f"\n📝 Transaction Summary:")
+        out.append(f"  Total transactions: {transaction_count}")
+        out.append(f"  Income entries:     {income_count}")
+        out.append(f"  Expense entries:    {expense_count}")
 
         # Daily average
         days_in_month = (end_date - start_date).days + 1
         if income_expense["expense"] > 0:
             daily_avg = income_expense["expense"] / days_in_month
-            print(f"  Daily avg spending: ${daily_avg:.2f}")
+            out.append(f"  Daily avg spending: ${daily_avg:.2f}")
 
+        write_lines(out)
         return {
-            "period": f"{start_date.strftime('%B %Y')}",
+            "period": period,
             "income_expense": income_expense,
             "spending_by_category": spending_by_category,
-            "transaction_count": len(transactions),
+            "transaction_count": transaction_count,
             "daily_average": daily_avg if income_expense["expense"] > 0 else 0,
         }
 
     def yearly_report(self, year: int = None) -> Dict[str, Any]:
         """Generate a comprehensive yearly report."""
+        out = []
         if year is None:
             year = datetime.now().year
 
         start_date = datetime(year, 1, 1)
         end_date = datetime(year, 12, 31, 23, 59, 59)
 
-        print(f"\n📊 Yearly Report for {year}")
-        print("=" * 60)
+        out.append(f"\n📊 Yearly Report for {year}")
+        out.append("=" * 60)
 
         # Overall financial summary
         income_expense = self.db.get_income_vs_expenses(start_date, end_date)
-        print(f"\n💰 Annual Financial Summary:")
-        print(f"  Total Income:   ${income_expense['income']:>12.2f}")
-        print(f"  Total Expenses: ${income_expense['expense']:>12.2f}")
-        print(f"  Net Income:     ${income_expense['net']:>12.2f}")
+        out.append(f"\n💰 Annual Financial Summary:")
+        out.append(f"  Total Income:   ${income_expense['income']:>12.2f}")
+        out.append(f"  Total Expenses: ${income_expense['expense']:>12.2f}")
+        out.append(f"  Net Income:     ${income_expense['net']:>12.2f}")
 
         if income_expense["net"] >= 0:
-            print("  Status:         ✅ Profitable year")
+            out.append("  Status:         ✅ Profitable year")
         else:
-            print("  Status:         ⚠️  Loss for the year")
+            out.append("  Status:         ⚠️  Loss for the year")
 
         # Monthly breakdown
-        print(f"\n📅 Monthly Breakdown:")
-        print(f"{'Month':<12} {'Income':<12} {'Expenses':<12} {'Net':<12}")
-        print("-" * 50)
-
-        monthly_data = []
+        out.append(f"\n📅 Monthly Breakdown:")
+        out.append(f"{'Month':<12} {'Income':<12} {'Expenses':<12} {'Net':<12}")
+        out.append("-" * 50)
+
+        # One list per column, indexed by month
+        monthly_data: Dict[str, List[Any]] = {
+            "month": [],
+            "income": [],
+            "expenses": [],
+            "net": [],
+        }
+        monthly_totals = self.db.get_monthly_income_vs_expenses(year)
         for month in range(1, 13):
-            month_start = datetime(year, month, 1)
-            _, last_day = monthrange(year, month)
-            month_end = datetime(year, month, last_day, 23, 59, 59)
-
-            month_summary = self.db.get_income_vs_expenses(month_start, month_end)
-            month_name = month_start.strftime("%b")
+            month_summary = monthly_totals[month]
+            month_name = _MONTH_ABBR[month - 1]
 
-            print(
+            out.append(
                 f"{month_name:<12} "
                 f"${month_summary['income']:<11.2f} "
                 f"${month_summary['expense']:<11.2f} "
                 f"${month_summary['net']:<11.2f}"
             )
 
-            monthly_data.append(
-                {
-                    "month": month_name,
-                    "income": float(month_summary["income"]),
-                    "expenses": float(month_summary["expense"]),
-                    "net": float(month_summary["net"]),
-                }
-            )
+            monthly_data["month"].append(month_name)
+            monthly_data["income"].append(float(month_summary["income"]))
+            monthly_data["expenses"].append(float(month_summary["expense"]))
+            monthly_data["net"].append(float(month_summary["net"]))
 
-        # Category analysis
-        spending_by_category = self.db.get_spending_by_category(start_date, end_date)
-        if spending_by_category:
-            print(f"\n📈 Top Spending Categories:")
-            total_spending = sum(spending_by_category.values())
-            top_categories = sorted(
-                spending_by_category.items(), key=lambda x: x[1], reverse=True
-            )[:10]
-
-            for category, amount in top_categories:
-                if amount > 0:
-                    percentage = (
-                        (amount / total_spending * 100) if total_spending > 0 else 0
-                    )
-                    print(f"  {category:<25} ${amount:>10.2f} ({percentage:>5.1f}%)")
+        # Category analysis: SQLite ranks the categories and keeps the top 10;
+        # the returned data still carries the full per-category mapping
+        top_categories, total_spending = self.db.get_top_spending_categories(
+            start_date, end_date, limit=10
+        )
+        spending_by_category, _ = self.db.get_spending_by_category(start_date, end_date)
+        if top_categories:
+            out.append(f"\n📈 Top Spending Categories:")
+            out.extend(
+                _category_lines(top_categories, total_spending, _TOP_CATEGORY_ROW)
+            )
 
         # Calculate averages
         monthly_avg_income = income_expense["income"] / 12
         monthly_avg_expense = income_expense["expense"] / 12
 
-        print(f"\n📊 Averages:")
-        print(f"  Monthly avg income:  ${monthly_avg_income:>10.2f}")
-        print(f"  Monthly avg expense: ${monthly_avg_expense:>10.2f}")
+        out.append(f"\n📊 Averages:")
+        out.append(f"  Monthly avg income:  ${monthly_avg_income:>10.2f}")
+        out.append(f"  Monthly avg expense: ${monthly_avg_expense:>10.2f}")
 
+        write_lines(out)
         return {
             "year": year,
             "income_expense": income_expense,
             "monthly_data": monthly_data,
             "spending_by_category": spending_by_category,
+            "top_categories": dict(top_categories),
             "monthly_averages": {
                 "income": float(monthly_avg_income),
                 "expense": float(monthly_avg_expense),
@@ -193,56 +230,48 @@ class ReportGenerator:
 
     def summary_report(self) -> Dict[str, Any]:
         """Generate a quick summary report of current financial status."""
-        print(f"\n📊 Financial Summary")
-        print("=" * 40)
+        out = []
+        out.append(f"\n📊 Financial Summary")
+        out.append("=" * 40)
 
         # Current month
         now = datetime.now()
         start_of_month = datetime(now.year, now.month, 1)
 
         month_summary = self.db.get_income_vs_expenses(start_of_month, now)
-        print(f"\n💰 This Month ({now.strftime('%B')}):")
-        print(f"  Income:   ${month_summary['income']:>10.2f}")
-        print(f"  Expenses: ${month_summary['expense']:>10.2f}")
-        print(f"  Net:      ${month_summary['net']:>10.2f}")
+        out.append(f"\n💰 This Month ({_MONTH_FULL[now.month - 1]}):")
+        out.append(f"  Income:   ${month_summary['income']:>10.2f}")
+        out.append(f"  Expenses: ${month_summary['expense']:>10.2f}")
+        out.append(f"  Net:      ${month_summary['net']:>10.2f}")
 
         # Current year
         start_of_year = datetime(now.year, 1, 1)
         year_summary = self.db.get_income_vs_expenses(start_of_year, now)
-        print(f"\n💰 This Year ({now.year}):")
-        print(f"  Income:   ${year_summary['income']:>10.2f}")
-        print(f"  Expenses: ${year_summary['expense']:>10.2f}")
-        print(f"  Net:      ${year_summary['net']:>10.2f}")
+        out.append(f"\n💰 This Year ({now.year}):")
+        out.append(f"  Income:   ${year_summary['income']:>10.2f}")
+        out.append(f"  Expenses: ${year_summary['expense']:>10.2f}")
+        out.append(f"  Net:      ${year_summary['net']:>10.2f}")
 
         # Budget status
-        budgets = self.db.get_budgets(is_active=True)
-        if budgets:
-            print(f"\n💳 Budget Status:")
-            over_budget_count = 0
-            for budget in budgets:
-                summary = self.db.get_budget_summary(budget)
-                if summary.is_over_budget:
-                    over_budget_count += 1
-
-            print(f"  Active budgets: {len(budgets)}")
-            print(f"  Over budget:    {over_budget_count}")
+        budget_summaries = self.db.get_all_budget_summaries()
+        if budget_summaries:
+            out.append(f"\n💳 Budget Status:")
+            over_budget_count = sum(1 for s in budget_summaries if s.is_over_budget)
+
+            out.append(f"  Active budgets: {len(budget_summaries)}")
+            out.append(f"  Over budget:    {over_budget_count}")
             if over_budget_count > 0:
-                print("  Status:         ⚠️  Some budgets exceeded")
+                out.append("  Status:         ⚠️  Some budgets exceeded")
             else:
-                print("  Status:         ✅ All budgets on track")
+                out.append("  Status:         ✅ All budgets on track")
 
-        # Recent transactions
-        recent_transactions = self.db.get_transactions(limit=5)
+        # Recent transactions, with category names joined in by the query
+        recent_transactions = self.db.get_transactions_with_category_name(limit=5)
         if recent_transactions:
-            print(f"\n📝 Recent Transactions:")
-            categories = {c.id: c.name for c in self.db.get_all_categories()}
-            for trans in recent_transactions:
-                category_name = (
-                    categories.get(trans.category_id, "N/A")
-                    if trans.category_id
-                    else "N/A"
-                )
-                print(
+            out.append(f"\n📝 Recent Transactions:")
+            for trans, category_name in recent_transactions:
+                category_name = category_name or "N/A"
+                out.append(
                     f"  {trans.date.strftime('%m/%d')} "
                     f"{trans.transaction_type.value[:3].upper()} "
                     f"${trans.amount:>8.2f} "
@@ -250,11 +279,12 @@ class ReportGenerator:
                     f"{trans.description[:25]}"
                 )
 
+        write_lines(out)
         return {
             "current_month": month_summary,
             "current_year": year_summary,
-            "budget_count": len(budgets) if budgets else 0,
-            "over_budget_count": over_budget_count if budgets else 0,
+            "budget_count": len(budget_summaries),
+            "over_budget_count": over_budget_count if budget_summaries else 0,
         }
 
     def custom_report(
@@ -264,109 +294,86 @@ class ReportGenerator:
         category_name: str = None,
     ) -> Dict[str, Any]:
         """Generate a custom report for a specific date range and/or category."""
+        out = []
         if start_date is None:
             start_date = datetime.now() - timedelta(days=30)
         if end_date is None:
             end_date = datetime.now()
 
-        print(f"\n📊 Custom Report")
-        print(
+        out.append(f"\n📊 Custom Report")
+        out.append(
             f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
         )
         if category_name:
-            print(f"Category: {category_name}")
-        print("=" * 60)
+            out.append(f"Category: {category_name}")
+        out.append("=" * 60)
 
         category_id = None
         if category_name:
-            categories = [
-                c for c in self.db.get_all_categories() if c.name == category_name
-            ]
-            if not categories:
-                print(f"Category '{category_name}' not found.")
+            _, by_name = self.db.get_category_maps()
+            category_id = by_name.get(category_name)
+            if category_id is None:
+                out.append(f"Category '{category_name}' not found.")
+                write_lines(out)
                 return {}
-            category_id = categories[0].id
+
+        # Totals and counts per transaction type, aggregated in SQL
+        breakdown = self.db.get_type_breakdown(category_id, start_date, end_date)
+        total_income, income_count = breakdown["income"]
+        total_expense, expense_count = breakdown["expense"]
 
         # Financial summary
         if category_id:
-            # Get transactions for specific category
-            transactions = self.db.get_transactions(
-                category_id=category_id, start_date=start_date, end_date=end_date
-            )
-
-            total_income = sum(
-                t.amount
-                for t in transactions
-                if t.transaction_type == TransactionType.INCOME
-            )
-            total_expense = sum(
-                t.amount
-                for t in transactions
-                if t.transaction_type == TransactionType.EXPENSE
-            )
             net = total_income - total_expense
 
-            print(f"\n💰 Financial Summary for {category_name}:")
-            print(f"  Income:   ${total_income:>10.2f}")
-            print(f"  Expenses: ${total_expense:>10.2f}")
-            print(f"  Net:      ${net:>10.2f}")
+            out.append(f"\n💰 Financial Summary for {category_name}:")
+            out.append(f"  Income:   ${total_income:>10.2f}")
+            out.append(f"  Expenses: ${total_expense:>10.2f}")
+            out.append(f"  Net:      ${net:>10.2f}")
 
         else:
             # Overall summary
-            income_expense = self.db.get_income_vs_expenses(start_date, end_date)
-            print(f"\n💰 Overall Financial Summary:")
-            print(f"  Income:   ${income_expense['income']:>10.2f}")
-            print(f"  Expenses: ${income_expense['expense']:>10.2f}")
-            print(f"  Net:      ${income_expense['net']:>10.2f}")
+            income_expense = {
+                "income": total_income,
+                "expense": total_expense,
+                "net": total_income - total_expense,
+            }
+            out.append(f"\n💰 Overall Financial Summary:")
+            out.append(f"  Income:   ${income_expense['income']:>10.2f}")
+            out.append(f"  Expenses: ${income_expense['expense']:>10.2f}")
+            out.append(f"  Net:      ${income_expense['net']:>10.2f}")
 
             # Category breakdown
-            spending_by_category = self.db.get_spending_by_category(
+            spending_by_category, total_spending = self.db.get_spending_by_category(
                 start_date, end_date
             )
             if spending_by_category:
-                print(f"\n📈 Spending by Category:")
-                total_spending = sum(spending_by_category.values())
-                for category, amount in sorted(
-                    spending_by_category.items(), key=lambda x: x[1], reverse=True
-                ):
-                    if amount > 0:
-                        percentage = (
-                            (amount / total_spending * 100) if total_spending > 0 else 0
-                        )
-                        print(f"  {category:<20} ${amount:>8.2f} ({percentage:>5.1f}%)")
+                out.append(f"\n📈 Spending by Category:")
+                ranked = _rank_spending(spending_by_category)
+                out.extend(_category_lines(ranked, total_spending, _CATEGORY_ROW))
 
         # Transaction details
-        all_transactions = self.db.get_transactions(
-            category_id=category_id, start_date=start_date, end_date=end_date
-        )
-
-        print(f"\n📝 Transaction Summary:")
-        print(f"  Total transactions: {len(all_transactions)}")
+        transaction_count = income_count + expense_count
 
-        income_transactions = [
-            t for t in all_transactions if t.transaction_type == TransactionType.INCOME
-        ]
-        expense_transactions = [
-            t for t in all_transactions if t.transaction_type == TransactionType.EXPENSE
-        ]
-
-        print(f"  Income entries:     {len(income_transactions)}")
-        print(f"  Expense entries:    {len(expense_transactions)}")
+        out.append(f"\n📝 Transaction Summary:")
+        out.append(f"  Total transactions: {transaction_count}")
+        out.append(f"  Income entries:     {income_count}")
+        out.append(f"  Expense entries:    {expense_count}")
 
         # Daily/weekly averages
         days = (end_date - start_date).days + 1
-        if days > 0 and expense_transactions:
-            total_expenses = sum(t.amount for t in expense_transactions)
-            daily_avg = total_expenses / days
+        if days > 0 and expense_count:
+            daily_avg = total_expense / days
             weekly_avg = daily_avg * 7
-            print(f"  Daily avg spending: ${daily_avg:.2f}")
-            print(f"  Weekly avg spending: ${weekly_avg:.2f}")
+            out.append(f"  Daily avg spending: ${daily_avg:.2f}")
+            out.append(f"  Weekly avg spending: ${weekly_avg:.2f}")
 
+        write_lines(out)
         return {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
             "category": category_name,
-            "transaction_count": len(all_transactions),
+            "transaction_count": transaction_count,
             "summary": (
                 income_expense
                 if not category_id
@@ -378,35 +385,39 @@ class ReportGenerator:
             ),
         }
 
-    def _show_budget_performance(self, start_date: datetime, end_date: datetime):
-        """Show budget performance for the given period."""
-        budgets = self.db.get_budgets(is_active=True)
-        if not budgets:
+    def _show_budget_performance(
+        self, start_date: datetime, end_date: datetime, out: List[str]
+    ) -> None:
+        """Append the budget performance for the given period to ``out``."""
+        # Spending for every active budget comes from one grouped query
+        summaries = self.db.get_all_budget_summaries()
+        if not summaries:
             return
 
-        print(f"\n💳 Budget Performance:")
+        out.append(f"\n💳 Budget Performance:")
 
         # Filter budgets that are active during the period
-        relevant_budgets = []
-        for budget in budgets:
+        relevant_summaries = []
+        for summary in summaries:
+            budget = summary.budget
             if budget.start_date <= end_date and (
                 budget.end_date is None or budget.end_date >= start_date
             ):
-                relevant_budgets.append(budget)
+                relevant_summaries.append(summary)
 
-        if not relevant_budgets:
-            print("  No active budgets for this period.")
+        if not relevant_summaries:
+            out.append("  No active budgets for this period.")
             return
 
-        categories = {c.id: c.name for c in self.db.get_all_categories()}
+        categories, _ = self.db.get_category_maps()
 
-        print(
+        out.append(
             f"  {'Category':<15} {'Budget':<10} {'Spent':<10} {'Remaining':<12} {'Status':<12}"
         )
-        print("  " + "-" * 65)
+        out.append("  " + "-" * 65)
 
-        for budget in relevant_budgets:
-            summary = self.db.get_budget_summary(budget)
+        for summary in relevant_summaries:
+            budget = summary.budget
             category_name = categories.get(budget.category_id, "Unknown")
             if len(category_name) > 12:
                 category_name = category_name[:9] + "..."
@@ -418,7 +429,7 @@ class ReportGenerator:
             else:
                 status = "✅ Good"
 
-            print(
+            out.append(
                 f"  {category_name:<15} "
                 f"${budget.amount:<9.2f} "
                 f"${summary.spent_amount:<9.2f} "
@@ -426,58 +437,62 @@ class ReportGenerator:
                 f"{status:<12}"
             )
 
-    def export_to_csv(self, data: Dict[str, Any], filename: str):
+    def export_to_csv(self, data: Dict[str, Any], filename: str) -> None:
         """Export report data to CSV format."""
         try:
-            with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+            with open(
+                filename,
+                "w",
+                newline="",
+                encoding="utf-8",
+                buffering=_EXPORT_BUFFER_SIZE,
+            ) as csvfile:
                 if "monthly_data" in data:
-                    # Yearly report format
-                    writer = csv.DictWriter(
-                        csvfile, fieldnames=["month", "income", "expenses", "net"]
-                    )
-                    writer.writeheader()
-                    writer.writerows(data["monthly_data"])
+                    # Yearly report format: one column list per field
+                    columns = data["monthly_data"]
+                    writer = csv.writer(csvfile)
+                    writer.writerow(columns.keys())
+                    writer.writerows(zip(*columns.values()))
                 else:
                     # Simple format for other reports
-                    writer = csv.writer(csvfile)
-                    writer.writerow(
+                    rows = [
                         [
                             "Report Type",
                             "Generated On",
                             datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         ]
-                    )
-
+                    ]
                     for key, value in data.items():
                         if isinstance(value, dict):
-                            writer.writerow([key, ""])
-                            for subkey, subvalue in value.items():
-                                writer.writerow(["  " + subkey, subvalue])
+                            rows.append([key, ""])
+                            rows.extend(
+                                ["  " + subkey, subvalue]
+                                for subkey, subvalue in value.items()
+                            )
                         else:
-                            writer.writerow([key, value])
+                            rows.append([key, value])
+
+                    csv.writer(csvfile).writerows(rows)
 
             print(f"✓ Report exported to {filename}")
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
 
-    def export_to_json(self, data: Dict[str, Any], filename: str):
+    def export_to_json(self, data: Dict[str, Any], filename: str) -> None:
         """Export report data to JSON format."""
         try:
-            # Convert Decimal objects to float for JSON serialization
-            def decimal_to_float(obj):
-                if isinstance(obj, Decimal):
-                    return float(obj)
-                elif isinstance(obj, dict):
-                    return {k: decimal_to_float(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [decimal_to_float(item) for item in obj]
-                return obj
-
-            json_data = decimal_to_float(data)
-            json_data["generated_on"] = datetime.now().isoformat()
+            # Decimals are converted by the encoder as it reaches them, so
+            # only the top-level dict is copied
+            json_data = dict(data, generated_on=datetime.now().isoformat())
 
             with open(filename, "w", encoding="utf-8") as jsonfile:
-                json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
+                json.dump(
+                    json_data,
+                    jsonfile,
+                    indent=2,
+                    ensure_ascii=False,
+                    default=_json_default,
+                )
 
             print(f"✓ Report exported to {filename}")
         except Exception as e:
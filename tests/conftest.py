@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from budget_manager.database import DatabaseManager
+from budget_manager.models import Category
+
+
+@pytest.fixture(scope="module")
+def template_db():
+    """In-memory database whose schema is built once per test module."""
+    db = DatabaseManager(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def category_id(template_db):
+    """Id of the seed category present in every test database."""
+    return template_db.create_category(
+        Category(name="Test Category", description="Test description")
+    )
+
+
+@pytest.fixture
+def db(template_db, category_id):
+    """The template database; everything the test writes is rolled back."""
+    template_db.begin()
+    yield template_db
+    template_db.rollback()
+
+
+@pytest.fixture
+def fresh_db(template_db, category_id):
+    """A private copy of the template database, for tests that commit."""
+    db = DatabaseManager(":memory:", template=template_db)
+    yield db
+    db.close()
@@ -3,30 +3,36 @@ Integration tests for the CLI interface.
 """
 
 import unittest
-import tempfile
 import os
+import subprocess
 import sys
+from datetime import datetime
 from io import StringIO
 from unittest.mock import patch
 
 # Add src directory to path for testing
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+sys.path.insert(0, SRC_DIR)
 
-from budget_manager.cli import BudgetManagerCLI
+from budget_manager.cli import BudgetManagerCLI, main
 from budget_manager.database import DatabaseManager
 
+# Shared test value, read once per module
+NOW = datetime.now()
+
 
 class TestBudgetManagerCLI(unittest.TestCase):
     """Test cases for the CLI interface."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the full argument parser once for all tests."""
+        cls.parser = BudgetManagerCLI.create_parser()
+    
     def setUp(self):
         """Set up test environment."""
-        # Create temporary database
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
-        self.temp_db.close()
-        
-        # Initialize CLI with test database
-        self.cli = BudgetManagerCLI(self.temp_db.name)
+        # Initialize CLI with an in-memory test database
+        self.cli = BudgetManagerCLI(":memory:")
         
         # Capture stdout for testing output
         self.held, sys.stdout = sys.stdout, StringIO()
@@ -34,7 +40,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment."""
         sys.stdout = self.held
-        os.unlink(self.temp_db.name)
+        self.cli.close()
     
     def get_output(self):
         """Get captured stdout output."""
@@ -46,7 +52,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         test_args = ['add-category', 'Food', 'Food and dining expenses']
         
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.add_category(args)
         
@@ -66,12 +72,12 @@ class TestBudgetManagerCLI(unittest.TestCase):
         test_args2 = ['add-category', 'Transport', 'Transport expenses']
         
         with patch('sys.argv', ['budget'] + test_args1):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args1)
             self.cli.add_category(args)
         
         with patch('sys.argv', ['budget'] + test_args2):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args2)
             self.cli.add_category(args)
         
@@ -81,7 +87,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # List categories
         test_args = ['list-categories']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.list_categories(args)
         
@@ -94,7 +100,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # First add a category
         test_args_cat = ['add-category', 'Food', 'Food expenses']
         with patch('sys.argv', ['budget'] + test_args_cat):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_cat)
             self.cli.add_category(args)
         
@@ -104,7 +110,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # Add transaction
         test_args = ['add-transaction', '-a', '25.50', '-d', 'Lunch', '-c', 'Food', 'expense']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.add_transaction(args)
         
@@ -122,7 +128,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # First add a category
         test_args_cat = ['add-category', 'Food', 'Food expenses']
         with patch('sys.argv', ['budget'] + test_args_cat):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_cat)
             self.cli.add_category(args)
         
@@ -132,7 +138,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # Set budget
         test_args = ['set-budget', 'Food', '500.00', 'monthly']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.set_budget(args)
         
@@ -150,7 +156,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # Add category and transactions
         test_args_cat = ['add-category', 'Food', 'Food expenses']
         with patch('sys.argv', ['budget'] + test_args_cat):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_cat)
             self.cli.add_category(args)
         
@@ -159,12 +165,12 @@ class TestBudgetManagerCLI(unittest.TestCase):
         test_args_t2 = ['add-transaction', '-a', '50.00', '-d', 'Dinner', '-c', 'Food', 'expense']
         
         with patch('sys.argv', ['budget'] + test_args_t1):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_t1)
             self.cli.add_transaction(args)
         
         with patch('sys.argv', ['budget'] + test_args_t2):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_t2)
             self.cli.add_transaction(args)
         
@@ -174,7 +180,7 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # List transactions
         test_args = ['list-transactions', '--limit', '10']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.list_transactions(args)
         
@@ -184,12 +190,55 @@ class TestBudgetManagerCLI(unittest.TestCase):
         self.assertIn('$25.00', output)
         self.assertIn('$50.00', output)
     
+    def test_budget_status_command(self):
+        """Test budget status amounts for an overspent budget."""
+        month_start = NOW.strftime('%Y-%m-01')
+        today = NOW.strftime('%Y-%m-%d')
+        commands = [
+            ['add-category', 'Food'],
+            ['set-budget', 'Food', '20.00', 'monthly', '--start-date', month_start],
+            ['add-transaction', '-a', '25.50', '-d', 'Lunch', '-c', 'Food',
+             'expense', '--date', today],
+        ]
+        for test_args in commands:
+            parser = self.parser
+            args = parser.parse_args(test_args)
+            self.cli.COMMAND_TABLE[args.command](self.cli, args)
+
+        sys.stdout = StringIO()
+        test_args = ['budget-status']
+        parser = self.parser
+        self.cli.budget_status(parser.parse_args(test_args))
+
+        output = self.get_output()
+        self.assertIn('$20.00', output)
+        self.assertIn('$25.50', output)
+        self.assertIn('$-5.50', output)
+        self.assertIn('Over Budget!', output)
+    
+    def test_delete_category_requires_terminal_to_confirm(self):
+        """Test that deletion without --force is refused off a terminal."""
+        test_args = ['add-category', 'Food']
+        self.cli.add_category(self.parser.parse_args(test_args))
+
+        test_args = ['delete-category', 'Food']
+        args = self.parser.parse_args(test_args)
+        with patch('sys.stdin.isatty', return_value=False):
+            self.cli.delete_category(args)
+        self.assertIn("Deletion cancelled.", self.get_output())
+        self.assertIsNotNone(self.cli.db.get_category_by_name('Food'))
+
+        with patch('sys.stdin.isatty', return_value=True), \
+                patch('builtins.input', return_value='y'):
+            self.cli.delete_category(args)
+        self.assertIsNone(self.cli.db.get_category_by_name('Food'))
+    
     def test_error_handling_invalid_category(self):
         """Test error handling for invalid category names."""
         # Try to add transaction with non-existent category
         test_args = ['add-transaction', '-a', '25.00', '-d', 'Test', '-c', 'NonExistent', 'expense']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args)
             self.cli.add_transaction(args)
         
@@ -201,22 +250,79 @@ class TestBudgetManagerCLI(unittest.TestCase):
         # Add category first
         test_args_cat = ['add-category', 'Food', 'Food expenses']
         with patch('sys.argv', ['budget'] + test_args_cat):
-            parser = self.cli.create_parser()
+            parser = self.parser
             args = parser.parse_args(test_args_cat)
             self.cli.add_category(args)
         
         # Clear output
         sys.stdout = StringIO()
         
-        # Try to add transaction with invalid amount
+        # Try to add transaction with invalid amount; argparse rejects it
         test_args = ['add-transaction', '-a', 'invalid', '-d', 'Test', '-c', 'Food', 'expense']
         with patch('sys.argv', ['budget'] + test_args):
-            parser = self.cli.create_parser()
-            args = parser.parse_args(test_args)
-            self.cli.add_transaction(args)
+            parser = self.parser
+            with patch('sys.stderr', StringIO()) as stderr:
+                with self.assertRaises(SystemExit):
+                    parser.parse_args(test_args)
         
-        output = self.get_output()
-        self.assertIn("Invalid amount 'invalid'", output)
+        self.assertIn("Invalid amount 'invalid'", stderr.getvalue())
+        self.assertEqual(self.cli.db.get_transactions(), [])
+
+    def test_error_handling_invalid_date(self):
+        """Test that malformed dates are rejected by the parser."""
+        test_args = ['list-transactions', '--start-date', '2024/01/01']
+        parser = self.parser
+        with patch('sys.stderr', StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                parser.parse_args(test_args)
+        self.assertIn("Invalid date format '2024/01/01'", stderr.getvalue())
+
+        args = parser.parse_args(['list-transactions', '--start-date', '2024-01-01'])
+        self.assertEqual(args.start_date.year, 2024)
+    
+    def test_parser_registers_only_sniffed_group(self):
+        """Test that only the invoked command group is registered."""
+        parser = self.cli.create_parser(['list-categories'])
+        args = parser.parse_args(['list-categories'])
+        self.assertEqual(args.command, 'list-categories')
+
+        with patch('sys.stderr', StringIO()):
+            with self.assertRaises(SystemExit):
+                parser.parse_args(['report', 'monthly'])
+
+        # Without argv every group is available, whatever sys.argv holds
+        with patch('sys.argv', ['budget', 'list-categories']):
+            parser = self.cli.create_parser()
+        args = parser.parse_args(['report', 'monthly'])
+        self.assertEqual(args.type, 'monthly')
+    
+    def test_run_dispatches_explicit_argv(self):
+        """Test that run() parses the argv it is given."""
+        self.cli.run(['add-category', 'Food'])
+        self.assertIsNotNone(self.cli.db.get_category_by_name('Food'))
+    
+    def test_list_commands_do_not_load_reports(self):
+        """Test that only the report command imports the reports module."""
+        code = (
+            "import sys; from budget_manager.cli import BudgetManagerCLI; "
+            "cli = BudgetManagerCLI(':memory:'); "
+            "[cli.run([c]) for c in ('list-categories', 'list-transactions', "
+            "'list-budgets', 'budget-status')]; "
+            "print('budget_manager.reports' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, env=env
+        )
+        self.assertEqual(result.stdout.splitlines()[-1], 'False')
+    
+    def test_main_closes_database(self):
+        """Test that main() closes the database even when the command exits."""
+        with patch.object(BudgetManagerCLI, 'run', side_effect=SystemExit(1)), \
+                patch.object(BudgetManagerCLI, 'close') as close:
+            with self.assertRaises(SystemExit):
+                main()
+        close.assert_called_once_with()
 
 
 if __name__ == '__main__':
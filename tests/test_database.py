@@ -2,330 +2,716 @@
 Unit tests for the database manager.
 """
 
-import unittest
-import tempfile
-import os
+import gc
+import sqlite3
+import weakref
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import pytest
+
 from budget_manager.database import DatabaseManager
 from budget_manager.models import Category, Transaction, Budget, TransactionType
 
+# Shared test values, built once per module
+NOW = datetime.now()
+AMT_10 = Decimal('10.00')
+AMT_50 = Decimal('50.00')
+AMT_100 = Decimal('100.00')
+
+
+def test_create_and_get_category(db):
+    """Test creating and retrieving a category."""
+    # Create category
+    category = Category(name="Food", description="Food expenses")
+    category_id = db.create_category(category)
+
+    # Retrieve category
+    retrieved = db.get_category(category_id)
+    assert retrieved is not None
+    assert retrieved.name == "Food"
+    assert retrieved.description == "Food expenses"
+
+
+def test_get_category_by_name(db, category_id):
+    """Test retrieving a category by name."""
+    retrieved = db.get_category_by_name("Test Category")
+    assert retrieved is not None
+    assert retrieved.id == category_id
+
+    assert db.get_category_by_name("Missing") is None
+
+
+def test_get_all_categories(db):
+    """Test retrieving all categories."""
+    # Should have at least the test category
+    categories = db.get_all_categories()
+    assert len(categories) >= 1
+
+    # Create another category
+    category2 = Category(name="Transport", description="Transport expenses")
+    db.create_category(category2)
 
-class TestDatabaseManager(unittest.TestCase):
-    """Test cases for DatabaseManager."""
-    
-    def setUp(self):
-        """Set up test database."""
-        # Create temporary database file
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
-        self.temp_db.close()
-        self.db = DatabaseManager(self.temp_db.name)
-        
-        # Create test category
-        self.test_category = Category(name="Test Category", description="Test description")
-        self.category_id = self.db.create_category(self.test_category)
-    
-    def tearDown(self):
-        """Clean up test database."""
-        os.unlink(self.temp_db.name)
-    
-    def test_create_and_get_category(self):
-        """Test creating and retrieving a category."""
-        # Create category
-        category = Category(name="Food", description="Food expenses")
-        category_id = self.db.create_category(category)
-        
-        # Retrieve category
-        retrieved = self.db.get_category(category_id)
-        self.assertIsNotNone(retrieved)
-        self.assertEqual(retrieved.name, "Food")
-        self.assertEqual(retrieved.description, "Food expenses")
-    
-    def test_get_all_categories(self):
-        """Test retrieving all categories."""
-        # Should have at least the test category
-        categories = self.db.get_all_categories()
-        self.assertGreaterEqual(len(categories), 1)
-        
-        # Create another category
-        category2 = Category(name="Transport", description="Transport expenses")
-        self.db.create_category(category2)
-        
-        categories = self.db.get_all_categories()
-        self.assertGreaterEqual(len(categories), 2)
-    
-    def test_update_category(self):
-        """Test updating a category."""
-        # Get the test category
-        category = self.db.get_category(self.category_id)
+    categories = db.get_all_categories()
+    assert len(categories) >= 2
+
+
+@pytest.mark.parametrize("op", ["update", "delete"])
+def test_category_crud(db, op):
+    """Test updating and deleting a category."""
+    category = Category(name="Original", description="Original description")
+    category_id = db.create_category(category)
+
+    if op == "update":
         category.name = "Updated Category"
         category.description = "Updated description"
-        
-        # Update
-        result = self.db.update_category(category)
-        self.assertTrue(result)
-        
-        # Verify update
-        updated = self.db.get_category(self.category_id)
-        self.assertEqual(updated.name, "Updated Category")
-        self.assertEqual(updated.description, "Updated description")
-    
-    def test_delete_category(self):
-        """Test deleting a category."""
-        # Create a category to delete
-        category = Category(name="To Delete")
-        category_id = self.db.create_category(category)
-        
-        # Delete it
-        result = self.db.delete_category(category_id)
-        self.assertTrue(result)
-        
-        # Verify deletion
-        deleted = self.db.get_category(category_id)
-        self.assertIsNone(deleted)
-    
-    def test_create_and_get_transaction(self):
-        """Test creating and retrieving a transaction."""
-        # Create transaction
-        transaction = Transaction(
-            amount=Decimal('50.00'),
-            description="Test transaction",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE
-        )
-        transaction_id = self.db.create_transaction(transaction)
-        
-        # Retrieve transaction
-        retrieved = self.db.get_transaction(transaction_id)
-        self.assertIsNotNone(retrieved)
-        self.assertEqual(retrieved.amount, Decimal('50.00'))
-        self.assertEqual(retrieved.description, "Test transaction")
-        self.assertEqual(retrieved.category_id, self.category_id)
-        self.assertEqual(retrieved.transaction_type, TransactionType.EXPENSE)
-    
-    def test_get_transactions_with_filters(self):
-        """Test retrieving transactions with various filters."""
-        # Create test transactions
-        t1 = Transaction(
-            amount=Decimal('25.00'),
-            description="Transaction 1",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE,
-            date=datetime.now() - timedelta(days=1)
-        )
-        t2 = Transaction(
-            amount=Decimal('100.00'),
-            description="Transaction 2",
-            category_id=self.category_id,
-            transaction_type=TransactionType.INCOME,
-            date=datetime.now()
-        )
-        
-        self.db.create_transaction(t1)
-        self.db.create_transaction(t2)
-        
-        # Test filter by category
-        transactions = self.db.get_transactions(category_id=self.category_id)
-        self.assertGreaterEqual(len(transactions), 2)
-        
-        # Test filter by type
-        expense_transactions = self.db.get_transactions(transaction_type=TransactionType.EXPENSE)
-        income_transactions = self.db.get_transactions(transaction_type=TransactionType.INCOME)
-        
-        self.assertGreater(len(expense_transactions), 0)
-        self.assertGreater(len(income_transactions), 0)
-        
-        # Test date filtering
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_transactions = self.db.get_transactions(start_date=today)
-        self.assertGreater(len(today_transactions), 0)
-    
-    def test_update_transaction(self):
-        """Test updating a transaction."""
-        # Create transaction
-        transaction = Transaction(
-            amount=Decimal('30.00'),
-            description="Original description",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE
+        assert db.update_category(category)
+
+        updated = db.get_category(category_id)
+        assert updated.name == "Updated Category"
+        assert updated.description == "Updated description"
+    else:
+        assert db.delete_category(category_id)
+        assert db.get_category(category_id) is None
+
+
+def test_categories_version_changes_on_write(db, category_id):
+    """Test that category writes bump categories_version."""
+    version = db.categories_version
+    db.get_all_categories()
+    assert db.categories_version == version
+
+    category = db.get_category(category_id)
+    category.name = "Renamed"
+    db.update_category(category)
+    assert db.categories_version > version
+
+
+def test_category_maps_follow_writes(db, category_id):
+    """Test that get_category_maps() is reused until a category write."""
+    by_id, by_name = db.get_category_maps()
+    assert by_id[category_id] == "Test Category"
+    assert by_name["Test Category"] == category_id
+    assert db.get_category_maps() == (by_id, by_name)
+    assert db.get_category_maps()[0] is by_id
+
+    food_id = db.create_category(Category(name="Food"))
+    by_id, by_name = db.get_category_maps()
+    assert by_id[food_id] == "Food"
+    assert by_name["Food"] == food_id
+
+
+def test_create_and_get_transaction(db, category_id):
+    """Test creating and retrieving a transaction."""
+    # Create transaction
+    transaction = Transaction(
+        amount=AMT_50,
+        description="Test transaction",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+    transaction_id = db.create_transaction(transaction)
+
+    # Retrieve transaction
+    retrieved = db.get_transaction(transaction_id)
+    assert retrieved is not None
+    assert retrieved.amount == AMT_50
+    assert retrieved.description == "Test transaction"
+    assert retrieved.category_id == category_id
+    assert retrieved.transaction_type == TransactionType.EXPENSE
+
+
+def test_get_transactions_with_filters(db, category_id):
+    """Test retrieving transactions with various filters."""
+    # Create test transactions
+    t1 = Transaction(
+        amount=Decimal('25.00'),
+        description="Transaction 1",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE,
+        date=NOW - timedelta(days=1)
+    )
+    t2 = Transaction(
+        amount=AMT_100,
+        description="Transaction 2",
+        category_id=category_id,
+        transaction_type=TransactionType.INCOME,
+        date=NOW
+    )
+
+    db.create_transactions_bulk([t1, t2])
+
+    # Test filter by category
+    transactions = db.get_transactions(category_id=category_id)
+    assert len(transactions) >= 2
+
+    # Test filter by type
+    expense_transactions = db.get_transactions(transaction_type=TransactionType.EXPENSE)
+    income_transactions = db.get_transactions(transaction_type=TransactionType.INCOME)
+
+    assert len(expense_transactions) > 0
+    assert len(income_transactions) > 0
+
+    # Test date filtering
+    today = NOW.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_transactions = db.get_transactions(start_date=today)
+    assert len(today_transactions) > 0
+
+    # Test limit keeps the most recent transactions
+    limited = db.get_transactions(limit=1)
+    assert [t.description for t in limited] == ["Transaction 2"]
+
+
+def test_iter_transactions(db, category_id):
+    """Test iterating over transactions lazily."""
+    db.create_transactions_bulk([
+        Transaction(
+            amount=Decimal('5.00'),
+            description=f"Item {i}",
+            category_id=category_id,
+            date=datetime(2024, 1, i + 1)
         )
-        transaction_id = self.db.create_transaction(transaction)
-        
-        # Update transaction
+        for i in range(3)
+    ])
+
+    iterator = db.iter_transactions(category_id=category_id)
+    assert next(iterator).description == "Item 2"
+    assert [t.description for t in iterator] == ["Item 1", "Item 0"]
+
+
+def test_get_transactions_sees_writes(db, category_id):
+    """Test that repeated transaction queries see later writes."""
+    assert db.get_transactions() == []
+
+    transaction = Transaction(
+        amount=AMT_10,
+        description="Cached",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+    db.create_transaction(transaction)
+    assert len(db.get_transactions()) == 1
+
+    db.delete_transaction(transaction.id)
+    assert db.get_transactions() == []
+
+
+def test_get_transactions_returns_independent_objects(db, category_id):
+    """Test that mutating a returned transaction does not affect later reads."""
+    db.create_transaction(Transaction(
+        amount=AMT_10, description="Original", category_id=category_id
+    ))
+    db.get_transactions()[0].description = "Mutated"
+    assert db.get_transactions()[0].description == "Original"
+
+
+def test_get_transactions_sees_other_connections():
+    """Test that writes through another manager are visible."""
+    name = "file:budget_shared_reads?mode=memory&cache=shared"
+    first = DatabaseManager(name, uri=True)
+    second = DatabaseManager(name, uri=True)
+    try:
+        assert first.get_transactions() == []
+        second.create_transaction(Transaction(amount=AMT_10, description="Other"))
+        assert len(first.get_transactions()) == 1
+    finally:
+        second.close()
+        first.close()
+
+
+def test_spending_and_categories_see_writes(db, category_id):
+    """Test that repeated category and spending reads see later writes."""
+    spending, total = db.get_spending_by_category()
+    assert total == Decimal('0')
+    categories = db.get_all_categories()
+
+    db.create_transaction(Transaction(
+        amount=AMT_10, description="Cached", category_id=category_id
+    ))
+    spending, total = db.get_spending_by_category()
+    assert spending["Test Category"] == AMT_10
+    assert total == AMT_10
+
+    db.create_category(Category(name="Added later"))
+    assert len(db.get_all_categories()) == len(categories) + 1
+    assert db.get_spending_by_category()[0]["Added later"] == Decimal('0')
+
+
+def test_get_all_categories_sees_other_connections():
+    """Test that categories created through another manager are visible."""
+    name = "file:budget_shared_categories?mode=memory&cache=shared"
+    first = DatabaseManager(name, uri=True)
+    second = DatabaseManager(name, uri=True)
+    try:
+        assert first.get_all_categories() == []
+        second.create_category(Category(name="Other"))
+        assert [c.name for c in first.get_all_categories()] == ["Other"]
+        assert "Other" in first.get_spending_by_category()[0]
+    finally:
+        second.close()
+        first.close()
+
+
+def test_get_transactions_with_category_name(db, category_id):
+    """Test that transactions come back with their category name."""
+    categorized = Transaction(
+        amount=Decimal('12.00'),
+        description="Categorized",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+    uncategorized = Transaction(
+        amount=Decimal('8.00'),
+        description="Uncategorized",
+        transaction_type=TransactionType.EXPENSE
+    )
+    db.create_transactions_bulk([categorized, uncategorized])
+
+    rows = db.get_transactions_with_category_name()
+    names = {t.description: name for t, name in rows}
+    assert names["Categorized"] == "Test Category"
+    assert names["Uncategorized"] is None
+
+
+def test_get_transactions_raw(db, category_id):
+    """Test the tuple rows used for transaction listings."""
+    transaction = Transaction(
+        amount=Decimal('12.34'),
+        description="Raw row",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE,
+        date=datetime(2024, 3, 5, 14, 30)
+    )
+    db.create_transaction(transaction)
+
+    rows = db.get_transactions_raw(limit=10)
+    assert rows == [
+        (transaction.id, "2024-03-05", "expense", 1234, "Test Category", "Raw row")
+    ]
+
+
+@pytest.mark.parametrize("op", ["update", "delete"])
+def test_transaction_crud(db, category_id, op):
+    """Test updating and deleting a transaction."""
+    transaction = Transaction(
+        amount=Decimal('30.00'),
+        description="Original description",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+    transaction_id = db.create_transaction(transaction)
+
+    if op == "update":
         transaction.amount = Decimal('35.00')
         transaction.description = "Updated description"
-        result = self.db.update_transaction(transaction)
-        self.assertTrue(result)
-        
-        # Verify update
-        updated = self.db.get_transaction(transaction_id)
-        self.assertEqual(updated.amount, Decimal('35.00'))
-        self.assertEqual(updated.description, "Updated description")
-    
-    def test_delete_transaction(self):
-        """Test deleting a transaction."""
-        # Create transaction
-        transaction = Transaction(
-            amount=Decimal('20.00'),
-            description="To delete",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE
-        )
-        transaction_id = self.db.create_transaction(transaction)
-        
-        # Delete it
-        result = self.db.delete_transaction(transaction_id)
-        self.assertTrue(result)
-        
-        # Verify deletion
-        deleted = self.db.get_transaction(transaction_id)
-        self.assertIsNone(deleted)
-    
-    def test_create_and_get_budget(self):
-        """Test creating and retrieving a budget."""
-        # Create budget
-        budget = Budget(
-            category_id=self.category_id,
-            amount=Decimal('200.00'),
-            period="monthly"
-        )
-        budget_id = self.db.create_budget(budget)
-        
-        # Retrieve budget
-        retrieved = self.db.get_budget(budget_id)
-        self.assertIsNotNone(retrieved)
-        self.assertEqual(retrieved.category_id, self.category_id)
-        self.assertEqual(retrieved.amount, Decimal('200.00'))
-        self.assertEqual(retrieved.period, "monthly")
-    
-    def test_get_budgets_with_filters(self):
-        """Test retrieving budgets with filters."""
-        # Create budgets
-        budget1 = Budget(
-            category_id=self.category_id,
-            amount=Decimal('100.00'),
-            period="monthly",
-            is_active=True
-        )
-        budget2 = Budget(
-            category_id=self.category_id,
-            amount=Decimal('50.00'),
-            period="weekly",
-            is_active=False
-        )
-        
-        self.db.create_budget(budget1)
-        self.db.create_budget(budget2)
-        
-        # Test filter by category
-        budgets = self.db.get_budgets(category_id=self.category_id)
-        self.assertGreaterEqual(len(budgets), 1)
-        
-        # Test filter by active status
-        active_budgets = self.db.get_budgets(is_active=True)
-        inactive_budgets = self.db.get_budgets(is_active=False)
-        
-        self.assertGreater(len(active_budgets), 0)
-        self.assertGreater(len(inactive_budgets), 0)
-    
-    def test_budget_summary(self):
-        """Test budget summary calculation."""
-        # Create budget
-        budget = Budget(
-            category_id=self.category_id,
-            amount=Decimal('100.00'),
-            period="monthly",
-            start_date=datetime.now() - timedelta(days=5)
-        )
-        budget_id = self.db.create_budget(budget)
-        budget = self.db.get_budget(budget_id)
-        
-        # Create some transactions
-        t1 = Transaction(
-            amount=Decimal('30.00'),
-            description="Expense 1",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE,
-            date=datetime.now() - timedelta(days=3)
-        )
-        t2 = Transaction(
-            amount=Decimal('20.00'),
-            description="Expense 2",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE,
-            date=datetime.now() - timedelta(days=1)
-        )
-        
-        self.db.create_transaction(t1)
-        self.db.create_transaction(t2)
-        
-        # Get budget summary
-        summary = self.db.get_budget_summary(budget)
-        
-        self.assertEqual(summary.spent_amount, Decimal('50.00'))
-        self.assertEqual(summary.remaining_amount, Decimal('50.00'))
-        self.assertEqual(summary.percentage_used, 50.0)
-        self.assertFalse(summary.is_over_budget)
-        self.assertEqual(summary.transaction_count, 2)
-    
-    def test_spending_by_category(self):
-        """Test spending by category analysis."""
-        # Create another category
-        category2 = Category(name="Transport")
-        category2_id = self.db.create_category(category2)
-        
-        # Create transactions in different categories
-        t1 = Transaction(
-            amount=Decimal('50.00'),
-            description="Food expense",
-            category_id=self.category_id,
-            transaction_type=TransactionType.EXPENSE
-        )
-        t2 = Transaction(
-            amount=Decimal('30.00'),
-            description="Transport expense",
-            category_id=category2_id,
-            transaction_type=TransactionType.EXPENSE
-        )
-        
-        self.db.create_transaction(t1)
-        self.db.create_transaction(t2)
-        
-        # Get spending by category
-        spending = self.db.get_spending_by_category()
-        
-        self.assertIn("Test Category", spending)
-        self.assertIn("Transport", spending)
-        self.assertEqual(spending["Test Category"], Decimal('50.00'))
-        self.assertEqual(spending["Transport"], Decimal('30.00'))
-    
-    def test_income_vs_expenses(self):
-        """Test income vs expenses analysis."""
-        # Create income and expense transactions
-        income = Transaction(
-            amount=Decimal('1000.00'),
-            description="Salary",
-            category_id=self.category_id,
-            transaction_type=TransactionType.INCOME
-        )
-        expense = Transaction(
-            amount=Decimal('300.00'),
-            description="Groceries",
-            category_id=self.category_id,
+        assert db.update_transaction(transaction)
+
+        updated = db.get_transaction(transaction_id)
+        assert updated.amount == Decimal('35.00')
+        assert updated.description == "Updated description"
+    else:
+        assert db.delete_transaction(transaction_id)
+        assert db.get_transaction(transaction_id) is None
+
+
+def test_create_transactions_bulk(db, category_id):
+    """Test creating many transactions at once."""
+    transactions = [
+        Transaction(
+            amount=Decimal(f'{i}.50'),
+            description=f"Bulk {i}",
+            category_id=category_id,
             transaction_type=TransactionType.EXPENSE
         )
-        
-        self.db.create_transaction(income)
-        self.db.create_transaction(expense)
-        
-        # Get income vs expenses
-        result = self.db.get_income_vs_expenses()
-        
-        self.assertGreaterEqual(result['income'], Decimal('1000.00'))
-        self.assertGreaterEqual(result['expense'], Decimal('300.00'))
-        self.assertGreaterEqual(result['net'], Decimal('700.00'))
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        for i in range(1, 4)
+    ]
+    ids = db.create_transactions_bulk(transactions)
+
+    assert ids == [t.id for t in transactions]
+    assert len(db.get_transactions()) == 3
+    assert db.get_transaction(ids[1]).amount == Decimal('2.50')
+
+
+def test_create_and_get_budget(db, category_id):
+    """Test creating and retrieving a budget."""
+    # Create budget
+    budget = Budget(
+        category_id=category_id,
+        amount=Decimal('200.00'),
+        period="monthly"
+    )
+    budget_id = db.create_budget(budget)
+
+    # Retrieve budget
+    retrieved = db.get_budget(budget_id)
+    assert retrieved is not None
+    assert retrieved.category_id == category_id
+    assert retrieved.amount == Decimal('200.00')
+    assert retrieved.period == "monthly"
+
+
+def test_get_budgets_with_filters(db, category_id):
+    """Test retrieving budgets with filters."""
+    # Create budgets
+    budget1 = Budget(
+        category_id=category_id,
+        amount=AMT_100,
+        period="monthly",
+        is_active=True
+    )
+    budget2 = Budget(
+        category_id=category_id,
+        amount=AMT_50,
+        period="weekly",
+        is_active=False
+    )
+
+    db.create_budgets_bulk([budget1, budget2])
+
+    # Test filter by category
+    budgets = db.get_budgets(category_id=category_id)
+    assert len(budgets) >= 1
+
+    # Test filter by active status
+    active_budgets = db.get_budgets(is_active=True)
+    inactive_budgets = db.get_budgets(is_active=False)
+
+    assert len(active_budgets) > 0
+    assert len(inactive_budgets) > 0
+
+
+def test_budget_summary(db, category_id):
+    """Test budget summary calculation."""
+    # Create budget
+    budget = Budget(
+        category_id=category_id,
+        amount=AMT_100,
+        period="monthly",
+        start_date=NOW - timedelta(days=5)
+    )
+    budget_id = db.create_budget(budget)
+    budget = db.get_budget(budget_id)
+
+    # Create some transactions
+    t1 = Transaction(
+        amount=Decimal('30.00'),
+        description="Expense 1",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE,
+        date=NOW - timedelta(days=3)
+    )
+    t2 = Transaction(
+        amount=Decimal('20.00'),
+        description="Expense 2",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE,
+        date=NOW - timedelta(days=1)
+    )
+
+    db.create_transactions_bulk([t1, t2])
+
+    # Get budget summary
+    summary = db.get_budget_summary(budget)
+
+    assert summary.spent_amount == AMT_50
+    assert summary.remaining_amount == AMT_50
+    assert summary.percentage_used == 50.0
+    assert not summary.is_over_budget
+    assert summary.transaction_count == 2
+
+
+def test_get_all_budget_summaries(db, category_id):
+    """Test summarizing every active budget at once."""
+    other_id = db.create_category(Category(name="Other"))
+    start = datetime(2024, 1, 1)
+    db.create_budgets_bulk([
+        Budget(category_id=category_id, amount=AMT_100,
+               start_date=start),
+        Budget(category_id=other_id, amount=AMT_10, start_date=start),
+    ])
+    db.create_transactions_bulk([
+        Transaction(amount=Decimal('30.00'), description="In period",
+                    category_id=category_id, date=datetime(2024, 1, 10)),
+        Transaction(amount=Decimal('12.50'), description="In period",
+                    category_id=category_id, date=datetime(2024, 1, 20)),
+        Transaction(amount=Decimal('99.00'), description="Next month",
+                    category_id=category_id, date=datetime(2024, 2, 10)),
+    ])
+
+    summaries = {
+        s.budget.category_id: s for s in db.get_all_budget_summaries()
+    }
+
+    assert summaries[category_id].spent_amount == Decimal('42.50')
+    assert summaries[category_id].transaction_count == 2
+    assert summaries[other_id].spent_amount == Decimal('0')
+    assert summaries[other_id].transaction_count == 0
+
+
+def test_spending_by_category(db, category_id):
+    """Test spending by category analysis."""
+    # Create another category
+    category2 = Category(name="Transport")
+    category2_id = db.create_category(category2)
+
+    # Create transactions in different categories
+    t1 = Transaction(
+        amount=AMT_50,
+        description="Food expense",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+    t2 = Transaction(
+        amount=Decimal('30.00'),
+        description="Transport expense",
+        category_id=category2_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+
+    db.create_transactions_bulk([t1, t2])
+
+    # Get spending by category
+    spending, total = db.get_spending_by_category()
+
+    assert "Test Category" in spending
+    assert "Transport" in spending
+    assert spending["Test Category"] == AMT_50
+    assert spending["Transport"] == Decimal('30.00')
+    assert total == Decimal('80.00')
+
+
+def test_spending_by_category_date_range(db, category_id):
+    """Test that date bounds filter transactions but keep every category."""
+    db.create_category(Category(name="Unused"))
+    db.create_transactions_bulk([
+        Transaction(amount=AMT_10, description="Old",
+                    category_id=category_id, date=datetime(2023, 12, 31)),
+        Transaction(amount=Decimal('25.00'), description="New",
+                    category_id=category_id, date=datetime(2024, 1, 15)),
+    ])
+
+    spending, total = db.get_spending_by_category(
+        start_date=datetime(2024, 1, 1)
+    )
+
+    assert spending["Test Category"] == Decimal('25.00')
+    assert spending["Unused"] == Decimal('0')
+    assert total == Decimal('25.00')
+
+
+def test_top_spending_categories(db, category_id):
+    """Test ranking categories by spending with a limit."""
+    transport_id = db.create_category(Category(name="Transport"))
+    db.create_category(Category(name="Unused"))
+    db.create_transactions_bulk([
+        Transaction(amount=Decimal('40.00'), description="Bus pass",
+                    category_id=transport_id, date=datetime(2024, 5, 1)),
+        Transaction(amount=AMT_10, description="Snack",
+                    category_id=category_id, date=datetime(2024, 5, 2)),
+        Transaction(amount=Decimal('99.00'), description="No category",
+                    date=datetime(2024, 5, 3)),
+    ])
+
+    top, total = db.get_top_spending_categories(
+        datetime(2024, 1, 1), datetime(2024, 12, 31), limit=1
+    )
+
+    assert top == [("Transport", Decimal('40.00'))]
+    assert total == AMT_50
+
+
+def test_income_vs_expenses(db, category_id):
+    """Test income vs expenses analysis."""
+    # Create income and expense transactions
+    income = Transaction(
+        amount=Decimal('1000.00'),
+        description="Salary",
+        category_id=category_id,
+        transaction_type=TransactionType.INCOME
+    )
+    expense = Transaction(
+        amount=Decimal('300.00'),
+        description="Groceries",
+        category_id=category_id,
+        transaction_type=TransactionType.EXPENSE
+    )
+
+    db.create_transactions_bulk([income, expense])
+
+    # Get income vs expenses
+    result = db.get_income_vs_expenses()
+
+    assert result['income'] >= Decimal('1000.00')
+    assert result['expense'] >= Decimal('300.00')
+    assert result['net'] >= Decimal('700.00')
+
+
+def test_monthly_income_vs_expenses(db, category_id):
+    """Test per-month income vs expenses for a year."""
+    db.create_transactions_bulk([
+        Transaction(amount=Decimal('1000.00'), description="Salary",
+                    transaction_type=TransactionType.INCOME,
+                    date=datetime(2024, 3, 1)),
+        Transaction(amount=Decimal('250.00'), description="Rent",
+                    category_id=category_id, date=datetime(2024, 3, 31, 23)),
+        Transaction(amount=Decimal('40.00'), description="Other year",
+                    category_id=category_id, date=datetime(2023, 3, 5)),
+    ])
+
+    months = db.get_monthly_income_vs_expenses(2024)
+
+    assert sorted(months) == list(range(1, 13))
+    assert months[3]["income"] == Decimal('1000.00')
+    assert months[3]["expense"] == Decimal('250.00')
+    assert months[3]["net"] == Decimal('750.00')
+    assert months[4]["net"] == Decimal('0')
+
+
+def test_type_breakdown(db, category_id):
+    """Test totals and counts per transaction type."""
+    other_id = db.create_category(Category(name="Other"))
+    db.create_transactions_bulk([
+        Transaction(amount=AMT_100, description="Refund",
+                    category_id=category_id,
+                    transaction_type=TransactionType.INCOME),
+        Transaction(amount=Decimal('20.00'), description="Expense 1",
+                    category_id=category_id),
+        Transaction(amount=Decimal('5.50'), description="Expense 2",
+                    category_id=category_id),
+        Transaction(amount=Decimal('9.00'), description="Elsewhere",
+                    category_id=other_id),
+    ])
+
+    breakdown = db.get_type_breakdown(category_id=category_id)
+
+    assert breakdown["income"] == (AMT_100, 1)
+    assert breakdown["expense"] == (Decimal('25.50'), 2)
+    assert db.get_type_breakdown(other_id)["income"] == (Decimal('0'), 0)
+
+
+def test_migrates_real_amounts_to_cents(tmp_path):
+    """Test that amounts stored as REAL by older versions are migrated."""
+    legacy = str(tmp_path / "legacy.db")
+
+    conn = sqlite3.connect(legacy)
+    conn.execute(
+        "CREATE TABLE transactions (id TEXT PRIMARY KEY, "
+        "amount DECIMAL(10,2) NOT NULL, description TEXT NOT NULL, "
+        "category_id TEXT, transaction_type TEXT NOT NULL, "
+        "date TIMESTAMP NOT NULL, created_at TIMESTAMP, notes TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO transactions VALUES "
+        "('t1', 19.99, 'Legacy', NULL, 'expense', "
+        "'2024-01-02 00:00:00', '2024-01-02 00:00:00', NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(legacy)
+    try:
+        assert db.get_transaction('t1').amount == Decimal('19.99')
+    finally:
+        db.close()
+
+
+def test_migration_drops_overlapping_index(tmp_path):
+    """Test that the (category, date) index of version 3 is dropped."""
+    path = str(tmp_path / "v3.db")
+    DatabaseManager(path).close()
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE INDEX idx_tx_cat_date ON transactions(category_id, date)"
+    )
+    conn.execute("PRAGMA user_version = 3")
+    conn.commit()
+    conn.close()
+
+    DatabaseManager(path).close()
+    conn = sqlite3.connect(path)
+    try:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(transactions)")}
+    finally:
+        conn.close()
+    assert "idx_tx_cat_date" not in indexes
+    assert "idx_tx_cat_type_date" in indexes
+
+
+def test_opens_sqlite_uri():
+    """Test that SQLite URIs are passed through when uri=True."""
+    name = "file:budget_uri_test?mode=memory&cache=shared"
+    db = DatabaseManager(name, uri=True)
+    other = DatabaseManager(name, uri=True)
+    try:
+        db.create_category(Category(name="Shared"))
+
+        # A second connection to the same URI sees the same database
+        assert other.get_category_by_name("Shared") is not None
+    finally:
+        other.close()
+        db.close()
+
+
+def test_close_is_idempotent():
+    """Test that closing a manager twice is harmless."""
+    db = DatabaseManager(":memory:")
+    db.close()
+    db.close()
+
+
+def test_unclosed_manager_can_be_collected():
+    """Test that an open manager is not kept alive until exit."""
+    ref = weakref.ref(DatabaseManager(":memory:"))
+    gc.collect()
+    assert ref() is None
+
+
+# Transaction control needs a database of its own, copied from the template
+def test_begin_and_rollback(fresh_db, category_id):
+    """Test that writes between begin() and rollback() are discarded."""
+    fresh_db.begin()
+    fresh_db.create_transaction(Transaction(
+        amount=AMT_10,
+        description="Rolled back",
+        category_id=category_id
+    ))
+    fresh_db.create_transactions_bulk([Transaction(
+        amount=Decimal('20.00'),
+        description="Also rolled back",
+        category_id=category_id
+    )])
+    fresh_db.rollback()
+
+    assert fresh_db.get_transactions() == []
+
+
+def test_batch_commits_and_rolls_back(fresh_db, category_id):
+    """Test that batch() commits on success and rolls back on error."""
+    transaction = Transaction(
+        amount=AMT_10,
+        description="Batched",
+        category_id=category_id
+    )
+    with fresh_db.batch():
+        fresh_db.create_transaction(transaction)
+        with fresh_db.batch():
+            transaction.description = "Updated in nested batch"
+            fresh_db.update_transaction(transaction)
+    assert fresh_db.get_transaction(transaction.id).description == (
+        "Updated in nested batch"
+    )
+
+    with pytest.raises(RuntimeError):
+        with fresh_db.batch():
+            fresh_db.delete_transaction(transaction.id)
+            raise RuntimeError("abort")
+    assert fresh_db.get_transaction(transaction.id) is not None
+
+
+def test_template_copy_is_independent(fresh_db, category_id, template_db):
+    """Test that a database built from a template is a separate copy."""
+    assert fresh_db.get_category(category_id).name == "Test Category"
+
+    fresh_db.create_category(Category(name="Only in copy"))
+    assert template_db.get_category_by_name("Only in copy") is None
@@ -5,6 +5,7 @@ Author: tara32473
 GitHub: https://github.com/tara32473/budget-manager
 """
 
+import sys
 import unittest
 from datetime import datetime
 from decimal import Decimal
@@ -17,6 +18,9 @@ from budget_manager.models import (
     TransactionType,
 )
 
+# Shared test value, built once per module
+AMT_100 = Decimal("100.00")
+
 
 class TestCategory(unittest.TestCase):
     """Test cases for Category model."""
@@ -29,6 +33,12 @@ class TestCategory(unittest.TestCase):
         self.assertIsNotNone(category.id)
         self.assertIsInstance(category.created_at, datetime)
 
+    def test_category_ids_are_unique_hex(self):
+        """Test that generated ids are distinct 32-digit hex strings."""
+        first, second = Category(name="A"), Category(name="B")
+        self.assertNotEqual(first.id, second.id)
+        self.assertRegex(first.id, r"^[0-9a-f]{32}$")
+
     def test_category_requires_name(self):
         """Test that category requires a name."""
         with self.assertRaises(ValueError):
@@ -58,6 +68,12 @@ class TestTransaction(unittest.TestCase):
         self.assertIsNotNone(transaction.id)
         self.assertIsInstance(transaction.date, datetime)
 
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need Python 3.10")
+    def test_transaction_uses_slots(self):
+        """Test that transactions carry no per-instance __dict__."""
+        transaction = Transaction(amount=Decimal("1.00"), description="Coffee")
+        self.assertFalse(hasattr(transaction, "__dict__"))
+
     def test_transaction_requires_description(self):
         """Test that transaction requires a description."""
         with self.assertRaises(ValueError):
@@ -65,19 +81,17 @@ class TestTransaction(unittest.TestCase):
 
     def test_transaction_requires_positive_amount(self):
         """Test that transaction amount must be positive."""
-        with self.assertRaises(ValueError):
-            Transaction(amount=Decimal("0"), description="Test")
-
-        with self.assertRaises(ValueError):
-            Transaction(amount=Decimal("-10.00"), description="Test")
+        for amount in (Decimal("0"), Decimal("-10.00")):
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValueError):
+                    Transaction(amount=amount, description="Test")
 
     def test_amount_precision(self):
         """Test that amount is correctly formatted to 2 decimal places."""
-        transaction = Transaction(amount=Decimal("10.1"), description="Test")
-        self.assertEqual(transaction.amount, Decimal("10.10"))
-
-        transaction2 = Transaction(amount=Decimal("10.999"), description="Test")
-        self.assertEqual(transaction2.amount, Decimal("11.00"))
+        for amount, expected in (("10.1", "10.10"), ("10.999", "11.00")):
+            with self.subTest(amount=amount):
+                transaction = Transaction(amount=Decimal(amount), description="Test")
+                self.assertEqual(transaction.amount, Decimal(expected))
 
 
 class TestBudget(unittest.TestCase):
@@ -97,60 +111,46 @@ class TestBudget(unittest.TestCase):
     def test_budget_requires_category_id(self):
         """Test that budget requires a category_id."""
         with self.assertRaises(ValueError):
-            Budget(category_id="", amount=Decimal("100.00"))
+            Budget(category_id="", amount=AMT_100)
 
     def test_budget_requires_positive_amount(self):
         """Test that budget amount must be positive."""
-        with self.assertRaises(ValueError):
-            Budget(category_id="test", amount=Decimal("0"))
-
-        with self.assertRaises(ValueError):
-            Budget(category_id="test", amount=Decimal("-100.00"))
+        for amount in (Decimal("0"), Decimal("-100.00")):
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValueError):
+                    Budget(category_id="test", amount=amount)
 
     def test_budget_end_date_calculation(self):
         """Test that end_date is calculated correctly based on period."""
         start_date = datetime(2024, 1, 15)
-
-        # Monthly budget
-        monthly_budget = Budget(
-            category_id="test",
-            amount=Decimal("100.00"),
-            period="monthly",
-            start_date=start_date,
-        )
-        expected_end = datetime(2024, 2, 1)
-        self.assertEqual(monthly_budget.end_date, expected_end)
-
-        # Weekly budget
-        weekly_budget = Budget(
-            category_id="test",
-            amount=Decimal("100.00"),
-            period="weekly",
-            start_date=start_date,
+        cases = (
+            ("monthly", datetime(2024, 2, 1)),
+            ("weekly", datetime(2024, 1, 22)),
+            ("yearly", datetime(2025, 1, 1)),
         )
-        expected_end = datetime(2024, 1, 22)
-        self.assertEqual(weekly_budget.end_date, expected_end)
-
-        # Yearly budget
-        yearly_budget = Budget(
-            category_id="test",
-            amount=Decimal("1000.00"),
-            period="yearly",
-            start_date=start_date,
-        )
-        expected_end = datetime(2025, 1, 1)
-        self.assertEqual(yearly_budget.end_date, expected_end)
+        for period, expected_end in cases:
+            with self.subTest(period=period):
+                budget = Budget(
+                    category_id="test",
+                    amount=AMT_100,
+                    period=period,
+                    start_date=start_date,
+                )
+                self.assertEqual(budget.end_date, expected_end)
 
 
 class TestBudgetSummary(unittest.TestCase):
     """Test cases for BudgetSummary model."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create the budget shared by the read-only summary tests."""
+        cls.budget = Budget(category_id="test", amount=AMT_100, period="monthly")
+
     def test_budget_summary_calculations(self):
         """Test that budget summary calculations are correct."""
-        budget = Budget(category_id="test", amount=Decimal("100.00"), period="monthly")
-
         summary = BudgetSummary(
-            budget=budget, spent_amount=Decimal("75.00"), transaction_count=5
+            budget=self.budget, spent_amount=Decimal("75.00"), transaction_count=5
         )
 
         self.assertEqual(summary.remaining_amount, Decimal("25.00"))
@@ -160,9 +160,7 @@ class TestBudgetSummary(unittest.TestCase):
 
     def test_over_budget_detection(self):
         """Test that over budget condition is detected correctly."""
-        budget = Budget(category_id="test", amount=Decimal("100.00"), period="monthly")
-
-        summary = BudgetSummary(budget=budget, spent_amount=Decimal("125.00"))
+        summary = BudgetSummary(budget=self.budget, spent_amount=Decimal("125.00"))
 
         self.assertEqual(summary.remaining_amount, Decimal("-25.00"))
         self.assertEqual(summary.percentage_used, 125.0)
@@ -0,0 +1,206 @@
+"""
+Unit tests for the report generator.
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from budget_manager.models import Budget, Category, Transaction, TransactionType
+from budget_manager.reports import ReportGenerator
+
+# All seeded transactions fall in March 2023
+MARCH_START = datetime(2023, 3, 1)
+MARCH_MID = datetime(2023, 3, 15, 12, 0)
+
+
+@pytest.fixture
+def seeded_db(db, category_id):
+    """The test database with income and expenses in two categories."""
+    food_id = db.create_category(Category(name="Food"))
+    db.create_transactions_bulk(
+        [
+            Transaction(
+                amount=Decimal("1000.00"),
+                description="Salary",
+                category_id=category_id,
+                transaction_type=TransactionType.INCOME,
+                date=MARCH_MID,
+            ),
+            Transaction(
+                amount=Decimal("120.50"),
+                description="Groceries",
+                category_id=food_id,
+                transaction_type=TransactionType.EXPENSE,
+                date=MARCH_MID,
+            ),
+            Transaction(
+                amount=Decimal("30.00"),
+                description="Stationery",
+                category_id=category_id,
+                transaction_type=TransactionType.EXPENSE,
+                date=MARCH_MID,
+            ),
+        ]
+    )
+    db.create_budget(
+        Budget(category_id=food_id, amount=Decimal("100.00"), start_date=MARCH_START)
+    )
+    return db
+
+
+def export_json(rg, data, tmp_path):
+    """Export ``data`` with export_to_json() and load it back."""
+    path = tmp_path / "report.json"
+    rg.export_to_json(data, str(path))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_monthly_report(seeded_db, capsys, tmp_path):
+    """Test the monthly report output, result and JSON export."""
+    rg = ReportGenerator(seeded_db)
+    data = rg.monthly_report(2023, 3)
+
+    out = capsys.readouterr().out
+    assert "Monthly Report for March 2023" in out
+    assert "Income:     $   1000.00" in out
+    assert "Expenses:   $    150.50" in out
+    assert "Food" in out
+    assert "Total transactions: 3" in out
+    assert "Over" in out  # Food spent 120.50 of its 100.00 budget
+
+    assert data["period"] == "March 2023"
+    assert data["income_expense"]["net"] == Decimal("849.50")
+    assert data["spending_by_category"]["Food"] == Decimal("120.50")
+    assert data["transaction_count"] == 3
+
+    exported = export_json(rg, data, tmp_path)
+    assert exported["period"] == "March 2023"
+    assert exported["income_expense"] == {
+        "income": 1000.0,
+        "expense": 150.5,
+        "net": 849.5,
+    }
+    assert exported["spending_by_category"] == {
+        "Food": 120.5,
+        "Test Category": 30.0,
+    }
+    assert exported["daily_average"] == pytest.approx(150.5 / 31)
+    assert "generated_on" in exported
+
+
+def test_yearly_report(seeded_db, capsys, tmp_path):
+    """Test the yearly report output, result and JSON export."""
+    rg = ReportGenerator(seeded_db)
+    data = rg.yearly_report(2023)
+
+    out = capsys.readouterr().out
+    assert "Yearly Report for 2023" in out
+    assert "Top Spending Categories:" in out
+    assert "Mar          $1000.00" in out
+
+    assert data["year"] == 2023
+    assert data["monthly_data"]["month"][2] == "Mar"
+    assert data["monthly_data"]["income"][2] == 1000.0
+    assert data["monthly_data"]["expenses"][2] == 150.5
+    assert sum(data["monthly_data"]["net"]) == 849.5
+
+    exported = export_json(rg, data, tmp_path)
+    assert exported["spending_by_category"] == {
+        "Food": 120.5,
+        "Test Category": 30.0,
+    }
+    assert list(exported["top_categories"]) == ["Food", "Test Category"]
+    assert exported["monthly_data"] == data["monthly_data"]
+    assert exported["monthly_averages"]["expense"] == pytest.approx(150.5 / 12)
+
+
+def test_summary_report(db, category_id, capsys, tmp_path):
+    """Test the summary report for the current month and year."""
+    now = datetime.now()
+    db.create_transaction(
+        Transaction(
+            amount=Decimal("42.00"),
+            description="Lunch",
+            category_id=category_id,
+            transaction_type=TransactionType.EXPENSE,
+            date=datetime(now.year, now.month, 1),
+        )
+    )
+    rg = ReportGenerator(db)
+    data = rg.summary_report()
+
+    out = capsys.readouterr().out
+    assert "Financial Summary" in out
+    assert "Recent Transactions:" in out
+    assert "Lunch" in out
+
+    assert data["current_month"]["expense"] == Decimal("42.00")
+    assert data["current_year"]["expense"] == Decimal("42.00")
+    assert data["budget_count"] == 0
+
+    exported = export_json(rg, data, tmp_path)
+    assert exported["current_month"] == {
+        "income": 0.0,
+        "expense": 42.0,
+        "net": -42.0,
+    }
+    assert exported["over_budget_count"] == 0
+
+
+def test_custom_report(seeded_db, capsys, tmp_path):
+    """Test the custom report over a date range and for one category."""
+    rg = ReportGenerator(seeded_db)
+    end = datetime(2023, 3, 31, 23, 59, 59)
+
+    data = rg.custom_report(MARCH_START, end)
+    out = capsys.readouterr().out
+    assert "Overall Financial Summary:" in out
+    assert "Total transactions: 3" in out
+    assert data["transaction_count"] == 3
+    assert data["summary"]["net"] == Decimal("849.50")
+
+    data = rg.custom_report(MARCH_START, end, "Food")
+    out = capsys.readouterr().out
+    assert "Financial Summary for Food:" in out
+    assert data["category"] == "Food"
+    assert data["transaction_count"] == 1
+
+    exported = export_json(rg, data, tmp_path)
+    assert exported["start_date"] == "2023-03-01T00:00:00"
+    assert exported["summary"] == {"income": 0.0, "expense": 120.5, "net": -120.5}
+
+
+def test_custom_report_unknown_category(db, capsys):
+    """Test that an unknown category gives an empty result."""
+    rg = ReportGenerator(db)
+    assert rg.custom_report(category_name="Missing") == {}
+    assert "Category 'Missing' not found." in capsys.readouterr().out
+
+
+def test_category_shares_round_half_even(db, category_id, capsys):
+    """Test that category shares round like Decimal, not like float."""
+    other_id = db.create_category(Category(name="Other"))
+    small_id = db.create_category(Category(name="Small"))
+    for cat, amount in (
+        (category_id, "1.90"),
+        (small_id, "1.30"),
+        (other_id, "196.80"),
+    ):
+        db.create_transaction(
+            Transaction(
+                amount=Decimal(amount),
+                description="Share",
+                category_id=cat,
+                transaction_type=TransactionType.EXPENSE,
+                date=datetime(2023, 4, 10),
+            )
+        )
+    ReportGenerator(db).monthly_report(2023, 4)
+
+    out = capsys.readouterr().out
+    assert "Test Category        $    1.90 (  1.0%)" in out  # 0.95%
+    assert "Small                $    1.30 (  0.6%)" in out  # 0.65%